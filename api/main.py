@@ -1,15 +1,24 @@
 """Main FastAPI application."""
 
 import logging
+import time
 from contextlib import asynccontextmanager
+from datetime import datetime
 
+import anyio.to_thread
+import httpx
+import orjson
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse, Response
 
 from api.middlewares.cors import add_cors_middleware
 from api.middlewares.error_handler import add_error_handling_middleware
 from api.routes.campaign_bot import router as campaign_bot_router
 from api.schemas.campaign_bot import HealthResponse
 from app.core.config.settings import settings
+from app.modules.ai_module.application.ai_service import AIService
+from app.modules.ai_module.infrastructure import openai_client
+from app.modules.campaign_module.infrastructure import lukia_api_client
 
 # Configure logging
 logging.basicConfig(
@@ -19,13 +28,30 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
-
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events."""
 
     logger.info("Starting Lukia Campaign Bot API")
 
+    # Raise the threadpool limit used for sync endpoints and dependencies
+    anyio.to_thread.current_default_thread_limiter().total_tokens = (
+        settings.threadpool_size
+    )
+
+    # Pooled HTTP client shared by every outbound Lukia API call
+    app.state.http_client = httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+        )
+    )
+
+    # Shared AI service, resolved per request by the routes' dependency
+    app.state.ai_service = AIService(http_client=app.state.http_client)
+    await app.state.ai_service.astart()
+
     # Initialize Telegram bot
     telegram_service = None
     try:
@@ -33,7 +59,7 @@ async def lifespan(app: FastAPI):
             TelegramBotService,
         )
 
-        telegram_service = TelegramBotService()
+        telegram_service = TelegramBotService(ai_service=app.state.ai_service)
 
         if await telegram_service.initialize():
             logger.info("Telegram bot initialized successfully")
@@ -42,7 +68,7 @@ async def lifespan(app: FastAPI):
         else:
             logger.warning("Telegram bot not initialized - token may be missing")
     except Exception as e:
-        logger.error(f"Failed to initialize Telegram bot: {e}")
+        logger.error("Failed to initialize Telegram bot: %s", e)
 
     yield
 
@@ -51,7 +77,12 @@ async def lifespan(app: FastAPI):
         try:
             await telegram_service.stop()
         except Exception as e:
-            logger.error(f"Error stopping Telegram bot: {e}")
+            logger.error("Error stopping Telegram bot: %s", e)
+
+    await app.state.ai_service.aclose()
+    await app.state.http_client.aclose()
+    await openai_client.aclose()
+    await lukia_api_client.aclose()
 
     logger.info("Shutting down Lukia Campaign Bot API")
 
@@ -63,6 +94,7 @@ def create_app() -> FastAPI:
         description="AI-powered campaign creation bot with LangGraph integration",
         version="1.0.0",
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
     )
 
     # Add middlewares
@@ -72,11 +104,30 @@ def create_app() -> FastAPI:
     # Add routes
     app.include_router(campaign_bot_router)
 
+    # Serialized /health body and when it was built; monitors poll this often,
+    # so the payload is rebuilt at most once per second
+    health_cache = {"built_at": 0.0, "body": b""}
+
     # Health check endpoint
-    @app.get("/health", response_model=HealthResponse, tags=["Health"])
-    async def health_check() -> HealthResponse:
+    @app.get(
+        "/health",
+        response_class=Response,
+        responses={200: {"model": HealthResponse, "content": {"application/json": {}}}},
+        tags=["Health"],
+    )
+    async def health_check() -> Response:
         """Health check endpoint."""
-        return HealthResponse(status="healthy")
+        now = time.monotonic()
+        if now - health_cache["built_at"] >= 1.0:
+            health_cache["body"] = orjson.dumps(
+                {
+                    "status": "healthy",
+                    "timestamp": datetime.now(),
+                    "version": app.version,
+                }
+            )
+            health_cache["built_at"] = now
+        return Response(content=health_cache["body"], media_type="application/json")
 
     return app
 
@@ -92,5 +143,9 @@ if __name__ == "__main__":
         host=settings.api_host,
         port=settings.api_port,
         reload=settings.debug,
+        workers=settings.api_workers,
         log_level="info",
+        # uvloop is picked automatically where installed (not on Windows)
+        loop="auto",
+        http="httptools",
     )
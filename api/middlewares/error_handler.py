@@ -1,12 +1,10 @@
 """Error handling middleware."""
 
 import logging
-from typing import Any, Dict
 
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from api.schemas.campaign_bot import ErrorResponse
 
@@ -14,19 +12,37 @@ from api.schemas.campaign_bot import ErrorResponse
 logger = logging.getLogger(__name__)
 
 
-class ErrorHandlingMiddleware(BaseHTTPMiddleware):
-    """Middleware for handling and logging errors."""
+class ErrorHandlingMiddleware:
+    """Pure ASGI middleware for handling and logging errors."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
 
-    async def dispatch(self, request: Request, call_next) -> Response:
         try:
-            response = await call_next(request)
-            return response
+            await self.app(scope, receive, send_wrapper)
         except HTTPException:
             # Re-raise HTTP exceptions to be handled by FastAPI
             raise
         except Exception as e:
             # Log unexpected errors
-            logger.error(f"Unexpected error: {str(e)}", exc_info=True)
+            logger.exception("Unexpected error")
+
+            # Headers are already on the wire, nothing left to replace
+            if response_started:
+                raise
 
             # Return user-friendly error response
             error_response = ErrorResponse(
@@ -35,10 +51,11 @@ class ErrorHandlingMiddleware(BaseHTTPMiddleware):
                 details={"type": type(e).__name__} if logger.isEnabledFor(logging.DEBUG) else None,
             )
 
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=500,
-                content=error_response.model_dump(),
+                content=error_response.model_dump(mode="json"),
             )
+            await response(scope, receive, send)
 
 
 def add_error_handling_middleware(app: FastAPI) -> None:
@@ -1,13 +1,14 @@
 """Campaign bot API routes with LangGraph integration."""
 
+import asyncio
 import logging
-from typing import Dict
+from typing import Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.encoders import jsonable_encoder
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import ORJSONResponse
 
 from api.schemas.campaign_bot import (
+    ChatBatchRequest,
     ChatMessageRequest,
     ChatMessageResponse,
     ConversationStatusResponse,
@@ -21,16 +22,13 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/v1/chat", tags=["Campaign Bot"])
 
-# Global AI service instance
-_ai_service = None
+# Reply for a batch item that failed; the cause is only logged server-side
+_BATCH_ITEM_ERROR_MESSAGE = "Failed to process message"
 
 
-def get_ai_service() -> AIService:
-    """Dependency injection for the AI service."""
-    global _ai_service
-    if _ai_service is None:
-        _ai_service = AIService()
-    return _ai_service
+async def get_ai_service(request: Request) -> AIService:
+    """Dependency injection for the AI service built at startup."""
+    return request.app.state.ai_service
 
 
 @router.post("/message", response_model=ChatMessageResponse)
@@ -61,12 +59,74 @@ async def send_message(
         )
 
     except Exception as e:
-        logger.error(f"Error processing message for user {request.user_id}: {str(e)}")
+        logger.error("Error processing message for user %s: %s", request.user_id, e)
         raise HTTPException(
             status_code=500, detail="Failed to process message"
         ) from e
 
 
+@router.post("/message/batch", response_model=List[ChatMessageResponse])
+async def send_message_batch(
+    request: ChatBatchRequest,
+    ai_service: AIService = Depends(get_ai_service),
+) -> List[ChatMessageResponse]:
+    """Send several messages to the campaign bot in one request.
+
+    Different users are processed concurrently. Messages from the same user
+    keep their order, so each one sees the state left by the previous one.
+
+    Unlike /message, one failed item does not fail the request: the batch
+    still returns 200 and that item comes back with state="error", a generic
+    message and no metadata. Only a failure of the batch itself is a 500.
+    """
+    responses: List[Optional[dict]] = [None] * len(request.messages)
+    indexes_by_user: Dict[str, List[int]] = {}
+    for index, item in enumerate(request.messages):
+        indexes_by_user.setdefault(item.user_id, []).append(index)
+
+    async def process_user_messages(indexes: List[int]) -> None:
+        for index in indexes:
+            item = request.messages[index]
+            responses[index] = await ai_service.process_user_message(
+                user_id=item.user_id,
+                message=item.message
+            )
+
+    try:
+        await asyncio.gather(
+            *(process_user_messages(indexes) for indexes in indexes_by_user.values())
+        )
+    except Exception as e:
+        logger.error("Error processing batch of %s messages: %s", len(request.messages), e)
+        raise HTTPException(
+            status_code=500, detail="Failed to process messages"
+        ) from e
+
+    results = []
+    for item, response in zip(request.messages, responses, strict=True):
+        if response["success"]:
+            results.append(
+                ChatMessageResponse(
+                    message=response["message"],
+                    state="active",
+                    requires_input=True,
+                    metadata=response.get("session_data") or {},
+                )
+            )
+            continue
+        logger.error(
+            "Error processing batch message for user %s: %s", item.user_id, response.get("error")
+        )
+        results.append(
+            ChatMessageResponse(
+                message=_BATCH_ITEM_ERROR_MESSAGE,
+                state="error",
+                requires_input=True,
+            )
+        )
+    return results
+
+
 @router.get("/status/{user_id}")
 async def get_conversation_status(
     user_id: str,
@@ -74,15 +134,24 @@ async def get_conversation_status(
 ) -> ConversationStatusResponse:
     """Get the current conversation status for a user."""
     try:
-        session_data = ai_service.get_user_session(user_id)
+        session_data = await ai_service.get_user_session(user_id)
 
         if not session_data:
-            return JSONResponse(content={"message": "No active session"}, status_code=200)
-
-        return JSONResponse(content=jsonable_encoder(session_data), status_code=200)
+            return ORJSONResponse(content={"message": "No active session"}, status_code=200)
+
+        # Messages are LangChain models; every other state field is already
+        # JSON-native, so dump just those and let orjson handle the rest
+        content = {
+            **session_data,
+            "messages": [
+                message.model_dump(mode="json")
+                for message in session_data.get("messages", [])
+            ],
+        }
+        return ORJSONResponse(content=content, status_code=200)
 
     except Exception as e:
-        logger.error(f"Error getting status for user {user_id}: {str(e)}")
+        logger.error("Error getting status for user %s: %s", user_id, e)
         raise HTTPException(
             status_code=500, detail="Failed to get conversation status"
         ) from e
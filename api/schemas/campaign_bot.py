@@ -13,11 +13,25 @@ class ChatMessageRequest(BaseModel):
     message: str = Field(..., description="User message", min_length=1)
 
 
+class ChatBatchRequest(BaseModel):
+    """Request model for a batch of chat messages."""
+
+    messages: List[ChatMessageRequest] = Field(
+        ..., description="Messages to process", min_length=1, max_length=50
+    )
+
+
 class ChatMessageResponse(BaseModel):
     """Response model for chat messages."""
 
     message: str = Field(..., description="Bot response message")
-    state: str = Field(..., description="Current conversation state")
+    state: str = Field(
+        ...,
+        description=(
+            "Current conversation state; in a batch, 'error' marks an item that "
+            "failed, with a generic message and no metadata"
+        ),
+    )
     requires_input: bool = Field(..., description="Whether bot expects user input")
     metadata: Optional[Dict[str, Any]] = Field(
         default=None, description="Additional response metadata"
@@ -19,13 +19,27 @@ class Settings(BaseSettings):
     # OpenAI Configuration
     openai_api_key: str = Field(..., env="OPENAI_API_KEY")
 
+    # Conversation state persistence (SQLite database path)
+    checkpoint_db_url: str = Field(
+        default="checkpoints.sqlite", env="CHECKPOINT_DB_URL"
+    )
+
     # Telegram Configuration
     telegram_bot_token: Optional[str] = Field(default=None, env="TELEGRAM_BOT_TOKEN")
 
     # FastAPI Configuration
     api_host: str = Field(default="127.0.0.1", env="API_HOST")
     api_port: int = Field(default=8000, env="API_PORT")
+    # Keep at 1 while conversation state and Telegram polling are per-process
+    api_workers: int = Field(default=1, env="API_WORKERS")
     debug: bool = Field(default=False, env="DEBUG")
+    # Worker threads for sync endpoints/dependencies (anyio defaults to 40)
+    threadpool_size: int = Field(default=100, env="THREADPOOL_SIZE")
+    # Outbound connection pool shared by the Lukia API client
+    http_max_connections: int = Field(default=200, env="HTTP_MAX_CONNECTIONS")
+    http_max_keepalive_connections: int = Field(
+        default=100, env="HTTP_MAX_KEEPALIVE_CONNECTIONS"
+    )
 
     # Default Campaign Configuration
     default_company: str = Field(default="Okolo", env="DEFAULT_COMPANY")
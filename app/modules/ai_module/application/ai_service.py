@@ -1,16 +1,25 @@
 """AI service for handling campaign conversations."""
 
-from typing import Dict, Optional
+from typing import Optional
+
+import httpx
 
 from app.modules.ai_module.infrastructure.campaign_graph import CampaignBotStateGraph
 
 
 class AIService:
-    """Service for handling AI-powered campaign conversations."""
+    """Service for handling AI-powered campaign conversations.
+
+    Call astart() inside the running event loop before processing messages.
+    """
+
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
+        # Conversation state lives in the graph checkpointer, keyed by user_id
+        self.state_graph = CampaignBotStateGraph(http_client=http_client)
 
-    def __init__(self):
-        self.state_graph = CampaignBotStateGraph()
-        self.user_sessions: Dict[str, Dict] = {}  # Store as dict directly
+    async def astart(self) -> None:
+        """Open the conversation checkpointer and build the graph."""
+        await self.state_graph.astart()
 
     async def process_user_message(self, user_id: str, message: str) -> dict:
         """Process a user message and return a response."""
@@ -21,9 +30,6 @@ class AIService:
                 user_id=user_id,
             )
 
-            # Store updated state
-            self.user_sessions[user_id] = updated_state
-
             # Return response
             return {
                 "success": True,
@@ -42,9 +48,13 @@ class AIService:
                 "error": str(e)
             }
 
-    def get_user_session(self, user_id: str) -> Optional[dict]:
+    async def get_user_session(self, user_id: str) -> Optional[dict]:
         """Get current session data for a user."""
-        state = self.state_graph.get_user_state(user_id)
+        state = await self.state_graph.get_user_state(user_id)
         if state:
             return state
         return None
+
+    async def aclose(self) -> None:
+        """Release resources held by the conversation graph."""
+        await self.state_graph.aclose()
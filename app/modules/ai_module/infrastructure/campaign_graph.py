@@ -2,14 +2,25 @@
 CampaignBotStateGraph - Main class that orchestrates the modular campaign bot
 """
 
+import asyncio
 import logging
-from typing import Dict, Any, Optional
+import weakref
+from typing import Any, ClassVar, Coroutine, Dict, Optional, Set
 
-from langgraph.checkpoint.memory import InMemorySaver
+import aiosqlite
+import httpx
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
 
-from app.modules.ai_module.infrastructure.conversation_state import ConversationState
+from app.core.config.settings import settings
+from app.modules.ai_module.infrastructure.conversation_state import (
+    INITIAL_STATE,
+    ConversationState,
+)
 from app.modules.campaign_module.application.campaign_service import LukiaService
-from app.modules.campaign_module.infrastructure.lukia_api_client import LukiaAPIClient
+from app.modules.campaign_module.infrastructure.lukia_api_client import (
+    LukiaAPIClient,
+    get_lukia_api_client,
+)
 from app.modules.ai_module.infrastructure.graph.builder import build_campaign_graph
 
 logger = logging.getLogger(__name__)
@@ -21,12 +32,79 @@ class CampaignBotStateGraph:
     Each node has one responsibility following microservices architecture.
     """
 
-    def __init__(self):
-        self.lukia_api = LukiaAPIClient()
-        self.campaign_service = LukiaService()
-        # Initialize in-memory checkpointer for state persistence
-        self.checkpointer = InMemorySaver()
-        self.graph = build_campaign_graph(self.campaign_service, self.checkpointer)
+    # Template for reset_user_state, copied on each reset
+    _INITIAL_STATE: ClassVar[ConversationState] = INITIAL_STATE
+
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
+        self.lukia_api = (
+            LukiaAPIClient(client=http_client)
+            if http_client is not None
+            else get_lukia_api_client()
+        )
+        self.campaign_service = LukiaService(api_client=self.lukia_api)
+        # Built by astart: AsyncSqliteSaver binds to the running event loop,
+        # so it cannot be created from synchronous construction
+        self.checkpointer: Optional[AsyncSqliteSaver] = None
+        self.graph = None
+        # Strong references so in-flight background tasks are not garbage collected
+        self._background_tasks: Set[asyncio.Task] = set()
+        # One lock per conversation while in use, so a background write to a
+        # thread's state never lands in the middle of a graph run on it
+        self._thread_locks: weakref.WeakValueDictionary[str, asyncio.Lock] = (
+            weakref.WeakValueDictionary()
+        )
+
+    async def astart(self) -> None:
+        """Open the checkpoint database and compile the graph; call once, in the loop"""
+        # SQLite checkpointer: state survives restarts and is shared across workers
+        conn = await aiosqlite.connect(settings.checkpoint_db_url)
+        self.checkpointer = AsyncSqliteSaver(conn)
+        await self.checkpointer.setup()
+        self.graph = build_campaign_graph(
+            self.campaign_service,
+            self._spawn,
+            self._record_activation,
+            self.checkpointer,
+        )
+
+    def _spawn(self, coro: Coroutine) -> asyncio.Task:
+        """Schedule a background task and keep it referenced until it finishes"""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
+
+    def _thread_lock(self, thread_id: str) -> asyncio.Lock:
+        lock = self._thread_locks.get(thread_id)
+        if lock is None:
+            lock = self._thread_locks[thread_id] = asyncio.Lock()
+        return lock
+
+    async def _record_activation(
+        self, thread_id: str, event_id: str, error: Optional[str]
+    ) -> None:
+        """Persist the outcome of a background activation on the user's checkpoint
+
+        error is None when activation succeeded. Outcomes for an event the
+        conversation has moved past (e.g. after "nueva campaña") are dropped.
+        """
+        config = {"configurable": {"thread_id": thread_id}}
+        async with self._thread_lock(thread_id):
+            state = await self.graph.aget_state(config)
+            if state.values.get("pending_event_id") != event_id:
+                logger.info("Dropping activation outcome for stale event %s", event_id)
+                return
+            await self.graph.aupdate_state(
+                config,
+                {
+                    "activation_error": error,
+                    "processing_status": "pending" if error is None else "error",
+                },
+                as_node="whatsapp_group_creator",
+            )
+        logger.info(
+            "Recorded activation %s for user %s", "failure" if error else "success", thread_id
+        )
 
     async def process_message(
         self,
@@ -42,61 +120,69 @@ class CampaignBotStateGraph:
                 "messages": [{"role": "user", "content": user_message}],
                 "user_message": user_message
             }
-            result = await self.graph.ainvoke(message, config)
-            logger.info(f"Graph execution completed for user {user_id}")
+            async with self._thread_lock(user_id):
+                result = await self.graph.ainvoke(message, config)
+            logger.info("Graph execution completed for user %s", user_id)
             return result  # result is already a dict
 
-        except Exception as e:
-            logger.error(f"Error processing message: {e}")
+        except Exception:
+            # The cause stays in the logs; callers relay bot_response to clients
+            logger.exception("Error processing message for user %s", user_id)
             return {
-                "bot_response": f"❌ Error: {str(e)}",
+                "bot_response": "❌ Ocurrió un error procesando tu mensaje. ¿Puedes intentar de nuevo?",
                 "current_step": "error",
                 "processing_status": "error",
             }
 
-    def get_user_state(self, user_id: str) -> Dict[str, Any]:
+    async def get_user_state(self, user_id: str) -> Dict[str, Any]:
         """Get the current state for a specific user"""
         try:
             config = {"configurable": {"thread_id": user_id}}
-            state = self.graph.get_state(config)
+            state = await self.graph.aget_state(config)
             return state.values if state.values else {}
         except Exception as e:
-            logger.error(f"Error getting state for user {user_id}: {e}")
+            logger.error("Error getting state for user %s: %s", user_id, e)
             return {}
 
-    def get_user_state_history(self, user_id: str) -> list:
+    async def get_user_state_history(self, user_id: str) -> list:
         """Get the state history for a specific user"""
         try:
             config = {"configurable": {"thread_id": user_id}}
-            return list(self.graph.get_state_history(config))
+            return [state async for state in self.graph.aget_state_history(config)]
         except Exception as e:
-            logger.error(f"Error getting state history for user {user_id}: {e}")
+            logger.error("Error getting state history for user %s: %s", user_id, e)
             return []
 
-    def reset_user_state(self, user_id: str) -> bool:
+    async def reset_user_state(self, user_id: str) -> bool:
         """Reset the state for a specific user (useful for starting over)"""
         try:
             config = {"configurable": {"thread_id": user_id}}
             # Create a fresh initial state
-            initial_state: ConversationState = {
-                "messages": [],
-                "campaign_name": None,
-                "event_name": None,
-                "event_date": None,
-                "admins": None,
-                "context": None,
-                "current_step": "greeting",
-                "user_message": "",
-                "bot_response": "¡Hola! Soy tu asistente para crear campañas con eventos y grupos de WhatsApp. ¿Cómo te llamas y qué campaña quieres crear?",
-                "campaign_id": None,
-                "event_id": None,
-                "whatsapp_group_url": None,
-                "processing_status": "idle"
-            }
+            initial_state: ConversationState = {**self._INITIAL_STATE, "messages": []}
             # This will overwrite the existing state
-            self.graph.update_state(config, initial_state)
-            logger.info(f"Reset state for user {user_id}")
+            await self.graph.aupdate_state(config, initial_state)
+            logger.info("Reset state for user %s", user_id)
             return True
         except Exception as e:
-            logger.error(f"Error resetting state for user {user_id}: {e}")
+            logger.error("Error resetting state for user %s: %s", user_id, e)
             return False
+
+    async def aclose(self, drain_timeout: float = 10.0) -> None:
+        """Finish background tasks, then close the checkpointer
+
+        The Lukia API client is not closed here: it either wraps the caller's
+        http_client or is the shared one closed by lukia_api_client.aclose.
+        """
+        if self._background_tasks:
+            logger.info(
+                "Waiting for %d background task(s) before shutdown",
+                len(self._background_tasks),
+            )
+            _, pending = await asyncio.wait(
+                set(self._background_tasks), timeout=drain_timeout
+            )
+            for task in pending:
+                logger.warning("Cancelling background task still running at shutdown")
+                task.cancel()
+        if self.checkpointer is not None:
+            await self.checkpointer.conn.close()
@@ -2,7 +2,7 @@
 ConversationState class for managing campaign bot state
 """
 
-from typing import Annotated, List, Optional, TypedDict
+from typing import Annotated, Final, List, Optional, TypedDict
 
 from langchain_core.messages import BaseMessage
 from langgraph.graph.message import add_messages
@@ -31,8 +31,31 @@ class ConversationState(TypedDict):
     campaign_id: Optional[str] = None
     event_id: Optional[str] = None
     pending_event_id: Optional[str] = None
+    activation_error: Optional[str] = None
     whatsapp_group_url: Optional[str] = None
     came_from_status_check: Optional[bool] = None
     
     # Response to user
     bot_response: str = ""
+
+
+# State a conversation starts from; every reset copies it with fresh messages
+INITIAL_STATE: Final[ConversationState] = {
+    "messages": [],
+    "campaign_name": None,
+    "event_name": None,
+    "event_date": None,
+    "admins": None,
+    "context": None,
+    "timezone": None,
+    "current_step": "greeting",
+    "user_message": "",
+    "bot_response": "¡Hola! Soy tu asistente para crear campañas con eventos y grupos de WhatsApp. ¿Cómo te llamas y qué campaña quieres crear?",
+    "campaign_id": None,
+    "event_id": None,
+    "pending_event_id": None,
+    "activation_error": None,
+    "whatsapp_group_url": None,
+    "came_from_status_check": None,
+    "processing_status": "idle",
+}
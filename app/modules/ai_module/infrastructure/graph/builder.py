@@ -4,6 +4,7 @@ Graph builder for campaign bot - creates and configures the StateGraph
 
 import logging
 from functools import partial
+from typing import Callable
 
 from langgraph.graph import END, StateGraph
 
@@ -35,8 +36,18 @@ from app.modules.campaign_module.infrastructure.lukia_api_client import LukiaAPI
 logger = logging.getLogger(__name__)
 
 
-def build_campaign_graph(lukia_service: LukiaService, checkpointer=None) -> StateGraph:
-    """Builds the LangGraph StateGraph with specialized nodes"""
+def build_campaign_graph(
+    lukia_service: LukiaService,
+    spawn: Callable,
+    record_activation: Callable,
+    checkpointer=None,
+) -> StateGraph:
+    """Builds the LangGraph StateGraph with specialized nodes
+
+    spawn schedules a coroutine as a background task that outlives the turn;
+    record_activation(thread_id, event_id, error) persists the outcome of a
+    background activation (error is None on success) for the next status check.
+    """
 
     # Create the graph with state schema
     graph = StateGraph(ConversationState)
@@ -45,7 +56,10 @@ def build_campaign_graph(lukia_service: LukiaService, checkpointer=None) -> Stat
     campaign_creator_with_api = partial(campaign_creator_node, lukia_service=lukia_service)
     event_creator_with_api = partial(event_creator_node, lukia_service=lukia_service)
     whatsapp_creator_with_api = partial(
-        whatsapp_group_creator_node, lukia_service=lukia_service
+        whatsapp_group_creator_node,
+        lukia_service=lukia_service,
+        spawn=spawn,
+        record_activation=record_activation,
     )
     status_checker_with_api = partial(group_status_checker_node, lukia_service=lukia_service)
 
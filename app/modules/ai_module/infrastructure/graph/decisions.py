@@ -9,15 +9,44 @@ from app.modules.ai_module.infrastructure.conversation_state import Conversation
 logger = logging.getLogger(__name__)
 
 
+# Steps that route the same way whatever the processing status is
+_ROUTER_STEP_ROUTES = {
+    "pending_group": "pending_group",
+    "completed": "completed",
+    "error": "error",
+}
+# Conversation steps END the flow and wait for the next user message
+_CONVERSATION_STEPS = frozenset(
+    {
+        "greeting",
+        "campaign_name",
+        "event_name",
+        "event_date",
+        "timezone",
+        "admins",
+        "context",
+        "confirmation",
+    }
+)
+
+_EVENT_CREATOR_TABLE = {
+    ("create_whatsapp_group", "creating_group"): "create_whatsapp_group",
+}
+
+_WHATSAPP_STATUS_ROUTES = {"completed": "completed", "creating": "completed"}
+
+_STATUS_ROUTES = {"completed": "completed", "error": "error"}
+
+
 def router_decision(state: ConversationState) -> str:
     """Decision function for router - determines next action"""
     current_step = state.get("current_step", "greeting")
     processing_status = state.get("processing_status", "idle")
 
-    logger.info(f"Router decision: step={current_step}, status={processing_status}")
+    logger.info("Router decision: step=%s, status=%s", current_step, processing_status)
 
     # If message is out of context, end the flow
-    if current_step == "out_of_context" or processing_status == "out_of_context":
+    if "out_of_context" in (current_step, processing_status):
         logger.info("Router decision: out of context message - ending flow")
         return "__end__"
 
@@ -25,44 +54,21 @@ def router_decision(state: ConversationState) -> str:
     if current_step == "check_status":
         return "check_status"
 
-    # If processing_status indicates campaign creation, route to campaign_creator
-    # Accept either 'create_campaign' or 'creating_campaign' as current_step values
-    if processing_status == "creating_campaign":
-        return "create_campaign"
-
-    # Backwards-compatible: explicit create_campaign step name
-    if current_step == "create_campaign" and processing_status == "idle":
+    # Campaign creation, by status or by the explicit create_campaign step
+    if processing_status == "creating_campaign" or (
+        current_step == "create_campaign" and processing_status == "idle"
+    ):
         return "create_campaign"
 
-    # If we're waiting for whatsapp_link
-    if current_step == "pending_group":
-        return "pending_group"
+    route = _ROUTER_STEP_ROUTES.get(current_step)
+    if route is not None:
+        return route
 
-    # If process is completed
-    if current_step == "completed":
-        return "completed"
-
-    # If there's an error
-    if current_step == "error":
-        return "error"
-
-    # For conversation steps, END the flow and wait for next user message
-    if current_step in [
-        "greeting",
-        "campaign_name",
-        "event_name",
-        "event_date",
-        "timezone",
-        "admins",
-        "context",
-        "confirmation",
-    ]:
-        return "__end__"
-
-    # Default: END
-    logger.warning(
-        f"Router decision: unexpected state, ending. Step: {current_step}"
-    )
+    # Conversation steps END the flow and wait for the next user message
+    if current_step not in _CONVERSATION_STEPS:
+        logger.warning(
+            "Router decision: unexpected state, ending. Step: %s", current_step
+        )
     return "__end__"
 
 
@@ -71,18 +77,16 @@ def event_creator_decision(state: ConversationState) -> str:
     current_step = state.get("current_step", "error")
     processing_status = state.get("processing_status", "error")
 
-    logger.info(f"Event creator decision: step={current_step}, status={processing_status}")
+    logger.info("Event creator decision: step=%s, status=%s", current_step, processing_status)
 
     # If event was created successfully, proceed to WhatsApp group creation
-    if current_step == "create_whatsapp_group" and processing_status == "creating_group":
-        return "create_whatsapp_group"
-    
+    route = _EVENT_CREATOR_TABLE.get((current_step, processing_status))
+    if route is not None:
+        return route
+
     # If there was an error, end the flow (user will see the error message)
-    if current_step == "error" or processing_status == "error":
-        return "error"
-    
-    # Default: error
-    logger.warning(f"Event creator decision: unexpected state, error. Step: {current_step}")
+    if current_step != "error" and processing_status != "error":
+        logger.warning("Event creator decision: unexpected state, error. Step: %s", current_step)
     return "error"
 
 
@@ -90,28 +94,22 @@ def whatsapp_decision(state: ConversationState) -> str:
     """Decision function for WhatsApp group creator"""
     processing_status = state.get("processing_status", "idle")
 
-    logger.info(f"WhatsApp decision: status={processing_status}")
+    logger.info("WhatsApp decision: status=%s", processing_status)
 
     # If group was created successfully (has link), go to completion
-    if processing_status == "completed" or processing_status == "creating":
-        return "completed"
     # If group is pending (async), go directly to status checker
     # if processing_status == "pending":
     #     return "pending"
-    return "error"
+    return _WHATSAPP_STATUS_ROUTES.get(processing_status, "error")
 
 
 def status_decision(state: ConversationState) -> str:
     """Decision function for status checker"""
     processing_status = state.get("processing_status", "idle")
 
-    logger.info(f"Status decision: status={processing_status}")
+    logger.info("Status decision: status=%s", processing_status)
 
-    if processing_status == "completed":
-        return "completed"
-    if processing_status == "error":
-        return "error"
-    return "wait"
+    return _STATUS_ROUTES.get(processing_status, "wait")
 
 
 def completion_decision(state: ConversationState) -> str:
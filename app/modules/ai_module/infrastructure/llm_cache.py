@@ -0,0 +1,99 @@
+"""
+In-process cache for LLM responses, keyed on the exact model input
+"""
+
+import hashlib
+import logging
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on cached responses; the least recently used entries are evicted first
+MAX_ENTRIES = 2048
+
+_cache: OrderedDict[str, Tuple[float, str]] = OrderedDict()
+
+_NON_WORD_RE = re.compile(r"[^\w]+")
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """Stand-in for an OpenAI response served from the cache"""
+
+    output_text: str
+
+
+def make_key(model: str, messages: List[Dict[str, Any]], **params: Any) -> str:
+    """Hash the model, messages and any extra request parameters into a cache key"""
+    payload = orjson.dumps([model, messages, params], option=orjson.OPT_SORT_KEYS)
+    return hashlib.sha256(payload).hexdigest()
+
+
+def normalize_text(text: str) -> str:
+    """Reduce a user message to its words so trivial rephrasings share a key
+
+    Lowercases, strips accents and punctuation and collapses whitespace, so
+    "¿Ya está listo?" and "ya esta listo" hit the same entry.
+    """
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return _NON_WORD_RE.sub(" ", stripped).strip()
+
+
+def lookup(key: str) -> Optional[str]:
+    """Return the cached output text for key, or None if missing or expired"""
+    entry = _cache.get(key)
+    if entry is None:
+        return None
+    expires_at, output_text = entry
+    if expires_at <= time.monotonic():
+        _cache.pop(key, None)
+        return None
+    _cache.move_to_end(key)
+    return output_text
+
+
+def store(key: str, output_text: str, ttl: float) -> None:
+    """Store output text under key for ttl seconds"""
+    _cache.pop(key, None)
+    if len(_cache) >= MAX_ENTRIES:
+        _cache.popitem(last=False)
+    _cache[key] = (time.monotonic() + ttl, output_text)
+
+
+def clear() -> None:
+    """Drop every cached response"""
+    _cache.clear()
+
+
+async def cached_responses_create(
+    client: Any,
+    *,
+    model: str,
+    messages: List[Dict[str, Any]],
+    ttl: float,
+    cache_messages: Optional[List[Dict[str, Any]]] = None,
+    **params: Any,
+) -> Any:
+    """Call client.responses.create, reusing the output for identical inputs
+
+    cache_messages, when given, is hashed instead of messages; callers use it to key
+    on a normalized form of the messages while still sending the original.
+    """
+    key = make_key(model, messages if cache_messages is None else cache_messages, **params)
+    output_text = lookup(key)
+    if output_text is not None:
+        logger.debug("LLM cache hit for %s", key[:12])
+        return CachedResponse(output_text=output_text)
+
+    response = await client.responses.create(model=model, input=messages, **params)
+    if response.output_text:
+        store(key, response.output_text, ttl)
+    return response
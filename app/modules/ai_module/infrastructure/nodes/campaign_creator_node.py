@@ -2,29 +2,25 @@
 Campaign creator node - handles campaign creation with LLM validation
 """
 
-import json
 import logging
-import traceback
+import re
 from datetime import datetime
-
-from langchain_core.messages import AIMessage
-from openai import OpenAI
+from typing import Final
 
 from app.core.config.settings import settings
 from app.modules.ai_module.infrastructure.conversation_state import ConversationState
+from app.modules.ai_module.infrastructure.nodes.llm_utils import (
+    json_schema_format,
+    run_llm_json,
+)
 from app.modules.campaign_module.application.campaign_service import LukiaService
 from app.modules.campaign_module.infrastructure.lukia_api_client import LukiaAPIClient
 
 logger = logging.getLogger(__name__)
-client = OpenAI()
 
-CAMPAIGN_CREATOR_PROMPT = """
+CAMPAIGN_CREATOR_PROMPT_STATIC = """
 Eres el creador de campañas. Recibes datos validados y debes crear una campaña.
 
-Datos de la campaña:
-- Nombre: {campaign_name}
-- Estado: {processing_status}
-
 Tu trabajo es:
 1. Validar que los datos están completos
 2. Crear la campaña usando la API
@@ -33,52 +29,77 @@ Tu trabajo es:
 Si algo falla, explica el error de manera amigable.
 
 Responde SOLO con JSON:
-{{
+{
   "should_create": true/false,
   "bot_response": "mensaje al usuario",
   "next_step": "create_event|error",
   "processing_status": "creating_event|error"
-}}
+}
+"""
+
+CAMPAIGN_CREATOR_PROMPT_DYNAMIC = """
+Datos de la campaña:
+- Nombre: {campaign_name}
+- Estado: {processing_status}
 """
 
+_STATIC_SYSTEM_MESSAGE: Final[dict] = {"role": "system", "content": CAMPAIGN_CREATOR_PROMPT_STATIC}
+
+
+# Names made of letters, digits, spaces and light punctuation need no LLM check
+_SIMPLE_NAME_RE = re.compile(r"[\w][\w .,'&()-]*")
+
+CAMPAIGN_CREATOR_TEXT_FORMAT = json_schema_format(
+    "campaign_creator",
+    {
+        "should_create": {"type": "boolean"},
+        "bot_response": {"type": "string"},
+        "next_step": {"type": "string", "enum": ["create_event", "error"]},
+        "processing_status": {"type": "string", "enum": ["creating_event", "error"]},
+    },
+)
+
 
 async def campaign_creator_node(
     state: ConversationState, lukia_service: LukiaService
 ) -> dict:
     """Creates campaign using LLM validation"""
     campaign_name = state.get("campaign_name")
-    logger.info(f"🏢 Creating campaign: {campaign_name}")
+    logger.info("🏢 Creating campaign: %s", campaign_name)
 
     try:
-        # Ask LLM for validation and guidance
-        response = client.responses.create(
-            model="gpt-5-mini",
-            input=[
-                {
-                    "role": "system",
-                    "content": CAMPAIGN_CREATOR_PROMPT.format(
-                        campaign_name=campaign_name,
-                        processing_status=state.get("processing_status"),
-                    ),
-                },
-                {"role": "user", "content": f"Crear campaña: {campaign_name}"},
-            ],
-            # temperature=0.1
-        )
-
-        llm_response = json.loads(response.output_text)
-        state["messages"] = AIMessage(content=response.output_text, additional_kwargs={"llm": "campaign_creator"})
+        if campaign_name and _SIMPLE_NAME_RE.fullmatch(campaign_name.strip()):
+            llm_response = {"should_create": True}
+        else:
+            # Ask LLM for validation and guidance
+            llm_response, state["messages"] = await run_llm_json(
+                [
+                    _STATIC_SYSTEM_MESSAGE,
+                    {
+                        "role": "system",
+                        "content": CAMPAIGN_CREATOR_PROMPT_DYNAMIC.format(
+                            campaign_name=campaign_name,
+                            processing_status=state.get("processing_status"),
+                        ),
+                    },
+                    {"role": "user", "content": f"Crear campaña: {campaign_name}"},
+                ],
+                text_format=CAMPAIGN_CREATOR_TEXT_FORMAT,
+                ttl=600,
+                fallback={"should_create": False, "bot_response": "No entendí la validación. ¿Puedes repetir?", "next_step": "error", "processing_status": "error"},
+                llm_tag="campaign_creator",
+            )
 
         if llm_response.get("should_create", True):
             result = await lukia_service.create_campaign_with_defaults(campaign_name)
 
             if result:
-                logger.info(f"✅ Campaign created: {result.id} {result}")
+                logger.info("✅ Campaign created: %s %s", result.id, result)
                 state["campaign_id"] = result.id
                 state["bot_response"] = (f"✅ Campaña '{campaign_name}' creada. Creando evento...")
                 state["current_step"] = "create_event"
                 state["processing_status"] = "creating_event"
-                logger.info(f"✅ Campaign created: {state['campaign_id']}")
+                logger.info("✅ Campaign created: %s", state['campaign_id'])
             else:
                 state["bot_response"] = (
                     "❌ Error al crear la campaña. ¿Intentamos de nuevo?"
@@ -93,8 +114,7 @@ async def campaign_creator_node(
             state["processing_status"] = llm_response.get("processing_status", "error")
 
     except Exception as e:
-        logger.error(traceback.format_exc())
-        logger.error(f"❌ Campaign creation error: {e}")
+        logger.exception("❌ Campaign creation error")
         state["bot_response"] = f"❌ Error técnico: {str(e)}"
         state["current_step"] = "error"
         state["processing_status"] = "error"
@@ -2,29 +2,27 @@
 Event creator node - handles event creation with LLM validation
 """
 
-import json
 import logging
-from openai import OpenAI
-import traceback
+import re
+import unicodedata
+from datetime import datetime, timezone as dt_timezone
+from functools import lru_cache
+from typing import Final, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from app.modules.ai_module.infrastructure.conversation_state import ConversationState
+from app.modules.ai_module.infrastructure.nodes.llm_utils import (
+    json_schema_format,
+    run_llm_json,
+)
 from app.modules.campaign_module.application.campaign_service import LukiaService
 from app.modules.campaign_module.domain.exceptions import InvalidEventDate
-from langchain_core.messages import AIMessage
 
 logger = logging.getLogger(__name__)
-client = OpenAI()
 
-EVENT_CREATOR_PROMPT = """
+EVENT_CREATOR_PROMPT_STATIC = """
 Eres el creador de eventos. Recibes datos validados para crear un evento.
 
-Datos del evento:
-- Nombre: {event_name}
-- Fecha: {event_date}
-- Campaign ID: {campaign_id}
-- Admins: {admins}
-- Contexto: {context}
-
 Valida que:
 1. Todos los datos estén completos
 2. Los administradores sean números de teléfono válidos
@@ -36,57 +34,176 @@ IMPORTANTE: Sobre timezone - Si detectas en el contexto o conversación alguna r
 Si hay algún error o datos inválidos, marca should_create como false y proporciona un mensaje claro al usuario.
 
 Responde SOLO con JSON:
-{{
+{
   "should_create": true/false,
   "bot_response": "mensaje al usuario (obligatorio si should_create es false)",
   "next_step": "create_whatsapp_group|error",
   "processing_status": "creating_group|error",
   "timezone": "America/Ciudad|null"
-}}
+}
+"""
+
+EVENT_CREATOR_PROMPT_DYNAMIC = """
+Datos del evento:
+- Nombre: {event_name}
+- Fecha: {event_date}
+- Campaign ID: {campaign_id}
+- Admins: {admins}
+- Contexto: {context}
 """
 
+_STATIC_SYSTEM_MESSAGE: Final[dict] = {"role": "system", "content": EVENT_CREATOR_PROMPT_STATIC}
+
+
+# Places users commonly mention, normalized (lowercase, no accents) -> IANA zone
+CITY_TIMEZONES = {
+    "colombia": "America/Bogota",
+    "bogota": "America/Bogota",
+    "medellin": "America/Bogota",
+    "cali": "America/Bogota",
+    "barranquilla": "America/Bogota",
+    "cartagena": "America/Bogota",
+    "bucaramanga": "America/Bogota",
+    "peru": "America/Lima",
+    "lima": "America/Lima",
+    "mexico": "America/Mexico_City",
+    "cdmx": "America/Mexico_City",
+    "guadalajara": "America/Mexico_City",
+    "monterrey": "America/Monterrey",
+    "argentina": "America/Argentina/Buenos_Aires",
+    "buenos aires": "America/Argentina/Buenos_Aires",
+    "chile": "America/Santiago",
+    "santiago": "America/Santiago",
+    "ecuador": "America/Guayaquil",
+    "quito": "America/Guayaquil",
+    "guayaquil": "America/Guayaquil",
+    "venezuela": "America/Caracas",
+    "caracas": "America/Caracas",
+    "panama": "America/Panama",
+    "costa rica": "America/Costa_Rica",
+    "san jose": "America/Costa_Rica",
+    "guatemala": "America/Guatemala",
+    "el salvador": "America/El_Salvador",
+    "honduras": "America/Tegucigalpa",
+    "republica dominicana": "America/Santo_Domingo",
+    "santo domingo": "America/Santo_Domingo",
+    "uruguay": "America/Montevideo",
+    "montevideo": "America/Montevideo",
+    "paraguay": "America/Asuncion",
+    "asuncion": "America/Asuncion",
+    "bolivia": "America/La_Paz",
+    "la paz": "America/La_Paz",
+    "sao paulo": "America/Sao_Paulo",
+    "miami": "America/New_York",
+    "nueva york": "America/New_York",
+    "new york": "America/New_York",
+    "espana": "Europe/Madrid",
+    "madrid": "Europe/Madrid",
+    "barcelona": "Europe/Madrid",
+}
+
+_CITY_RE = re.compile(
+    r"\b(" + "|".join(sorted(map(re.escape, CITY_TIMEZONES), key=len, reverse=True)) + r")\b"
+)
+_PHONE_RE = re.compile(r"\+?\d{7,15}")
+
+
+def _normalize(text: str) -> str:
+    """Lowercase and strip accents so city names match regardless of spelling"""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+@lru_cache(maxsize=128)
+def _is_iana_timezone(name: str) -> bool:
+    try:
+        ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return False
+    return True
+
+
+def _resolve_timezone(state: ConversationState) -> Optional[str]:
+    """Timezone from the collected data or a known city mention, or None"""
+    collected = (state.get("timezone") or "").strip()
+    if "/" in collected and _is_iana_timezone(collected):
+        return collected
+    for text in (collected, state.get("context") or ""):
+        match = _CITY_RE.search(_normalize(text))
+        if match:
+            return CITY_TIMEZONES[match.group(1)]
+    return None
+
+
+def _is_future_date(value: Optional[str]) -> bool:
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return False
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=dt_timezone.utc)
+    return parsed > datetime.now(dt_timezone.utc)
+
+
+def _event_data_is_valid(state: ConversationState) -> bool:
+    """Deterministic version of the checks the validation prompt asks for"""
+    admins = state.get("admins")
+    return bool(
+        (state.get("event_name") or "").strip()
+        and state.get("campaign_id")
+        and _is_future_date(state.get("event_date"))
+        and admins
+        and all(_PHONE_RE.fullmatch(str(admin).strip()) for admin in admins)
+    )
+
+
+EVENT_CREATOR_TEXT_FORMAT = json_schema_format(
+    "event_creator",
+    {
+        "should_create": {"type": "boolean"},
+        "bot_response": {"type": "string"},
+        "next_step": {"type": "string", "enum": ["create_whatsapp_group", "error"]},
+        "processing_status": {"type": "string", "enum": ["creating_group", "error"]},
+        "timezone": {"type": ["string", "null"]},
+    },
+)
+
 
 async def event_creator_node(state: ConversationState, lukia_service: LukiaService) -> dict:
     """Creates event using LLM validation"""
     event_name = state.get("event_name")
-    logger.info(f"🎪 Creating event: {event_name}")
+    logger.info("🎪 Creating event: %s", event_name)
 
     try:
-        # Ask LLM for validation
-        response = client.responses.create(
-            model="gpt-5-mini",
-            input=[
-                {"role": "system", "content": EVENT_CREATOR_PROMPT.format(
-                    event_name=event_name,
-                    event_date=state.get("event_date"),
-                    campaign_id=state.get("campaign_id"),
-                    admins=state.get("admins"),
-                    context=state.get("context")
-                )},
-                {"role": "user", "content": f"Crear evento: {event_name}"}
-            ],
-            #temperature=0.1
-        )
-        
-        # Robust parse for LLM JSON response
-        content = response.output_text
-        state["messages"] = AIMessage(content, additional_kwargs={"llm": "event_creator"})
-
-        try:
-            llm_response = json.loads(content)
-        except Exception:
-            try:
-                start = content.index("{")
-                end = content.rindex("}") + 1
-                llm_response = json.loads(content[start:end])
-            except Exception as e:
-                logger.debug(f"EventCreator LLM parse error, fallback: {e}")
-                llm_response = {"should_create": False, "bot_response": "No entendí la validación. Puedes repetir?", "next_step": "error", "processing_status": "error", "timezone": None}
+        # Skip the LLM when the data checks out and the timezone is known;
+        # it is only needed to judge unusual input or infer the timezone
+        known_timezone = _resolve_timezone(state)
+        if known_timezone and _event_data_is_valid(state):
+            llm_response = {"should_create": True}
+        else:
+            # Ask LLM for validation
+            llm_response, state["messages"] = await run_llm_json(
+                [
+                    _STATIC_SYSTEM_MESSAGE,
+                    {"role": "system", "content": EVENT_CREATOR_PROMPT_DYNAMIC.format(
+                        event_name=event_name,
+                        event_date=state.get("event_date"),
+                        campaign_id=state.get("campaign_id"),
+                        admins=state.get("admins"),
+                        context=state.get("context")
+                    )},
+                    {"role": "user", "content": f"Crear evento: {event_name}"}
+                ],
+                text_format=EVENT_CREATOR_TEXT_FORMAT,
+                ttl=600,
+                fallback={"should_create": False, "bot_response": "No entendí la validación. Puedes repetir?", "next_step": "error", "processing_status": "error", "timezone": None},
+                llm_tag="event_creator",
+            )
 
         if llm_response.get("should_create", True):
 
-            # Determine timezone: LLM may return a timezone string, otherwise use default
-            timezone = llm_response.get("timezone") or "America/Bogota"
+            # Determine timezone: collected/known city first, then the LLM's guess, then default
+            timezone = known_timezone or llm_response.get("timezone") or "America/Bogota"
 
             # Validate event_date before calling service: allow strings but ensure convertible
             event_date_value = state.get("event_date")
@@ -104,14 +221,13 @@ async def event_creator_node(state: ConversationState, lukia_service: LukiaServi
             except InvalidEventDate as exc:
                 # Use the friendly bot message if available
                 bot_message = getattr(exc, 'bot_message', str(exc))
-                logger.error(f"❌ Invalid event date: {exc}")
+                logger.error("❌ Invalid event date: %s", exc)
                 state["bot_response"] = bot_message
                 state["current_step"] = "error"
                 state["processing_status"] = "error"
                 return state
-            except Exception as exc:
-                logger.error(traceback.format_exc())
-                logger.error(f"❌ Event creation failed before activation: {exc}")
+            except Exception:
+                logger.exception("❌ Event creation failed before activation")
                 # Fail fast: set error state and do NOT continue to WhatsApp creation
                 state["bot_response"] = (
                     "❌ No pude crear el evento. Por favor revisa los datos y vuelve a intentarlo."
@@ -125,7 +241,7 @@ async def event_creator_node(state: ConversationState, lukia_service: LukiaServi
                 state["bot_response"] = f"✅ Evento '{event_name}' creado. Creando grupo WhatsApp..."
                 state["current_step"] = "create_whatsapp_group"
                 state["processing_status"] = "creating_group"
-                logger.info(f"✅ Event created: {state['event_id']}")
+                logger.info("✅ Event created: %s", state['event_id'])
             else:
                 state["bot_response"] = "❌ Error al crear el evento."
                 state["current_step"] = "error"
@@ -136,8 +252,7 @@ async def event_creator_node(state: ConversationState, lukia_service: LukiaServi
             state["processing_status"] = llm_response.get("processing_status", "error")
 
     except Exception as e:
-        logger.error(traceback.format_exc())
-        logger.error(f"❌ Event creation error: {e}")
+        logger.exception("❌ Event creation error")
         state["bot_response"] = f"❌ Error técnico: {str(e)}"
         state["current_step"] = "error"
         state["processing_status"] = "error"
@@ -2,114 +2,142 @@
 Group status checker node - handles WhatsApp group status checking with LLM intelligence
 """
 
-import json
+import asyncio
 import logging
-from openai import OpenAI
+from typing import Final
+
 from langchain_core.messages import AIMessage
 
+from app.modules.ai_module.infrastructure import llm_cache
 from app.modules.ai_module.infrastructure.conversation_state import ConversationState
+from app.modules.ai_module.infrastructure.nodes.llm_utils import (
+    json_schema_format,
+    run_llm_json,
+)
 from app.modules.campaign_module.application.campaign_service import LukiaService
 
 logger = logging.getLogger(__name__)
-client = OpenAI()
 
-STATUS_CHECKER_PROMPT = """
+STATUS_CHECKER_PROMPT_STATIC = """
 Eres el verificador de estado de grupos WhatsApp. El usuario pregunta sobre el estado de un evento/grupo.
 
-Contexto:
-- Mensaje usuario: "{user_message}"
-- Event ID disponible: {event_id}
-- Estado actual: {processing_status}
-
 Analiza el mensaje y decide:
-1. Si pregunta por estado y hay event_id -> verificar grupo
-2. Si pregunta por estado pero no hay event_id -> pedir SOLO el event_id
-3. Si dice otra cosa -> responder apropiadamente
-4. Si hay problema -> reportar error
+1. Si pregunta por estado -> verificar grupo
+2. Si dice otra cosa -> responder apropiadamente
+3. Si hay problema -> reportar error
 
-IMPORTANTE: Si no hay event_id disponible, pide al usuario que proporcione ÚNICAMENTE el ID del evento. Hazlo de forma amable y natural, por ejemplo: "Para poder verificar el estado, ¿podrías darme el ID del evento? 😊"
+Si decides verificar, el estado se consultará después. Escribe de antemano una respuesta natural y humana para cada resultado posible:
+- ready_template: el grupo está listo -> Celebrar y entregar el link de forma amigable. Escribe {link} donde va el link
+- pending_template: el grupo está en proceso -> Explicar que se está generando y dar tiempo estimado
+- not_found_template: no se encontró -> Explicar que el grupo aún puede estar pendiente o que el ID podría ser incorrecto, de forma amable
+- error_template: hubo un error -> Disculparse y sugerir reintentar
+
+EJEMPLOS DE BUENAS RESPUESTAS:
+- "¡Perfecto! 🎉 Tu grupo está listo: {link}. ¡Ya puedes compartirlo con tus invitados!"
+- "⏳ Tu grupo se está generando. Normalmente toma unos 2-3 minutos. ¿Puedes consultar en un momento?"
+- "No encontré un grupo para ese evento. ¿Podrías verificar el ID?"
 
 Responde SOLO con JSON:
-{{
+{
   "should_check": true/false,
   "bot_response": "respuesta al usuario si NO debe verificar",
   "next_step": "completed|wait|error",
-  "processing_status": "completed|pending|error"
-}}
+  "processing_status": "completed|pending|error",
+  "ready_template": "respuesta si el grupo está listo, con {link}",
+  "pending_template": "respuesta si el grupo está pendiente",
+  "not_found_template": "respuesta si no se encontró el grupo",
+  "error_template": "respuesta si hubo un error"
+}
 """
 
-STATUS_RESPONSE_PROMPT = """
-Eres el generador de respuestas para consultas de estado de grupos WhatsApp.
-
-Situación:
+STATUS_CHECKER_PROMPT_DYNAMIC = """
+Contexto:
 - Mensaje usuario: "{user_message}"
-- Event ID: {event_id}
-- Estado encontrado: {status_result}
-- Link del grupo: {group_link}
-- Error: {error_message}
-
-Genera una respuesta natural y humana según el resultado:
-
-1. Si hay link disponible -> Celebrar y entregar el link de forma amigable
-2. Si grupo está pendiente -> Explicar que está en proceso y dar tiempo estimado
-3. Si no se encontró -> Explicar que el grupo aún puede estar pendiente o que el ID podría ser incorrecto, de forma amable
-4. Si hubo error -> Disculparse y sugerir reintentar
-
-EJEMPLOS DE BUENAS RESPUESTAS:
-- "¡Perfecto! 🎉 Tu grupo está listo: [link]. ¡Ya puedes compartirlo con tus invitados!"
-- "⏳ Tu grupo se está generando. Normalmente toma unos 2-3 minutos. ¿Puedes consultar en un momento?"
-- "No encontré un grupo para ese evento. ¿Podrías verificar el ID?"
-
-Responde SOLO con JSON:
-{{
-  "bot_response": "respuesta completamente natural y humana",
-  "current_step": "completed|wait|error",
-  "processing_status": "completed|pending|error"
-}}
+- Event ID disponible: {event_id}
+- Estado actual: {processing_status}
 """
 
-
-def _parse_llm_response(content: str, fallback_response: dict) -> dict:
-    """Parse LLM JSON response with robust fallback"""
-    try:
-        return json.loads(content)
-    except Exception:
-        try:
-            start = content.index("{")
-            end = content.rindex("}") + 1
-            return json.loads(content[start:end])
-        except Exception as e:
-            logger.debug(f"LLM parse error, using fallback: {e}")
-            return fallback_response
-
-
-def _should_check_status(user_message: str, event_id: str, processing_status: str) -> dict:
-    """Ask LLM if we should check status"""
+_STATIC_SYSTEM_MESSAGE: Final[dict] = {"role": "system", "content": STATUS_CHECKER_PROMPT_STATIC}
+
+STATUS_CHECKER_TEXT_FORMAT = json_schema_format(
+    "status_checker",
+    {
+        "should_check": {"type": "boolean"},
+        "bot_response": {"type": "string"},
+        "next_step": {"type": "string", "enum": ["completed", "wait", "error"]},
+        "processing_status": {"type": "string", "enum": ["completed", "pending", "error"]},
+        "ready_template": {"type": "string"},
+        "pending_template": {"type": "string"},
+        "not_found_template": {"type": "string"},
+        "error_template": {"type": "string"},
+    },
+)
+
+
+# Response used for each status result when the LLM gave no template,
+# plus the step/status every result moves the conversation to
+STATUS_RESULTS = {
+    "ready": {
+        "bot_response": "¡Perfecto! 🎉 Tu grupo está listo: {link}",
+        "current_step": "completed",
+        "processing_status": "completed",
+    },
+    "pending": {
+        "bot_response": "⏳ Tu grupo se está generando. Consulta en unos momentos.",
+        "current_step": "wait",
+        "processing_status": "pending",
+    },
+    "not_found": {
+        "bot_response": "No encontré un grupo para ese evento. ¿Podrías verificar el ID?",
+        "current_step": "error",
+        "processing_status": "error",
+    },
+    "error": {
+        "bot_response": "Hubo un problema consultando el estado. Intenta de nuevo en unos momentos.",
+        "current_step": "error",
+        "processing_status": "error",
+    },
+}
+
+
+def _build_input(user_message: str, event_id: str, processing_status: str) -> list:
+    """Messages for the status-check LLM call"""
+    return [
+        _STATIC_SYSTEM_MESSAGE,
+        {
+            "role": "system",
+            "content": STATUS_CHECKER_PROMPT_DYNAMIC.format(
+                user_message=user_message,
+                event_id=event_id or "No disponible",
+                processing_status=processing_status,
+            ),
+        },
+        {"role": "user", "content": user_message},
+    ]
+
+
+async def _should_check_status(user_message: str, event_id: str, processing_status: str) -> dict:
+    """Ask LLM if we should check status, along with a response per status result"""
     try:
-        response = client.responses.create(
-            model="gpt-5-mini",
-            input=[
-                {
-                    "role": "system",
-                    "content": STATUS_CHECKER_PROMPT.format(
-                        user_message=user_message,
-                        event_id=event_id or "No disponible",
-                        processing_status=processing_status,
-                    ),
-                },
-                {"role": "user", "content": user_message},
-            ],
+        decision, _ = await run_llm_json(
+            _build_input(user_message, event_id, processing_status),
+            # "¿Ya está?" and "ya esta" are the same question
+            cache_messages=_build_input(
+                llm_cache.normalize_text(user_message), event_id, processing_status
+            ),
+            text_format=STATUS_CHECKER_TEXT_FORMAT,
+            ttl=1800,
+            fallback={
+                "should_check": True,
+                "bot_response": "Verificaré el estado del grupo.",
+                "next_step": "wait",
+                "processing_status": "pending",
+            },
+            llm_tag="group_status_checker",
         )
-        
-        fallback = {
-            "should_check": True,
-            "bot_response": "Verificaré el estado del grupo.",
-            "next_step": "wait",
-            "processing_status": "pending",
-        }
-        return _parse_llm_response(response.output_text, fallback)
+        return decision
     except Exception as e:
-        logger.error(f"Error asking LLM for status check decision: {e}")
+        logger.error("Error asking LLM for status check decision: %s", e)
         return {
             "should_check": False,
             "bot_response": "No puedo verificar el estado en este momento. Intenta más tarde.",
@@ -131,103 +159,76 @@ async def _get_group_status(lukia_service: LukiaService, event_id: str) -> tuple
             return "not_found", "No disponible", ""
             
     except Exception as e:
-        logger.error(f"API error checking group status: {e}")
+        logger.error("API error checking group status: %s", e)
         return "error", "No disponible", "Error interno"
 
 
-def _generate_status_response(user_message: str, event_id: str, status_result: str, group_link: str, error_message: str) -> dict:
-    """Generate human response based on status result"""
-    try:
-        response = client.responses.create(
-            model="gpt-5-mini",
-            input=[
-                {
-                    "role": "system",
-                    "content": STATUS_RESPONSE_PROMPT.format(
-                        user_message=user_message,
-                        event_id=event_id,
-                        status_result=status_result,
-                        group_link=group_link,
-                        error_message=error_message,
-                    ),
-                },
-                {
-                    "role": "user",
-                    "content": f"Generar respuesta para consulta de estado: {status_result}",
-                },
-            ],
-        )
-        
-        # Fallback responses based on status
-        fallback_responses = {
-            "ready": {
-                "bot_response": f"¡Perfecto! 🎉 Tu grupo está listo: {group_link}",
-                "current_step": "completed",
-                "processing_status": "completed",
-            },
-            "pending": {
-                "bot_response": "⏳ Tu grupo se está generando. Consulta en unos momentos.",
-                "current_step": "wait",
-                "processing_status": "pending",
-            },
-            "not_found": {
-                "bot_response": "No encontré un grupo para ese evento. ¿Podrías verificar el ID?",
-                "current_step": "error",
-                "processing_status": "error",
-            },
-            "error": {
-                "bot_response": "Hubo un problema consultando el estado. Intenta de nuevo en unos momentos.",
-                "current_step": "error", 
-                "processing_status": "error",
-            }
-        }
-        
-        fallback = fallback_responses.get(status_result, fallback_responses["error"])
-        return _parse_llm_response(response.output_text, fallback)
-        
-    except Exception as e:
-        logger.error(f"Error generating status response: {e}")
-        return {
-            "bot_response": "No puedo generar una respuesta en este momento.",
-            "current_step": "error",
-            "processing_status": "error"
-        }
+def _render_status_response(decision: dict, status_result: str, group_link: str) -> dict:
+    """Fill the LLM template for the status result, falling back to a fixed response"""
+    result = STATUS_RESULTS.get(status_result, STATUS_RESULTS["error"])
+    template = decision.get(f"{status_result}_template") or result["bot_response"]
+    return {**result, "bot_response": template.replace("{link}", group_link)}
 
 
 async def group_status_checker_node(state: ConversationState, lukia_service: LukiaService) -> dict:
     """Checks WhatsApp group status using LLM intelligence"""
     user_message = state.get("user_message", "")
     event_id = state.get("event_id") or state.get("pending_event_id")
-    logger.info(f"🔍 Status check: '{user_message}' for event {event_id}")
+    logger.info("🔍 Status check: '%s' for event %s", user_message, event_id)
+
+    # Without an event id all we can do is ask for it; no LLM needed
+    if not event_id:
+        state["bot_response"] = "Para consultar el estado, ¿podrías darme el ID del evento? 😊"
+        state["current_step"] = "wait"
+        state["processing_status"] = "pending"
+        state["messages"] = AIMessage(state["bot_response"], additional_kwargs={"llm": "group_status_checker"})
+        return state
+
+    # The background activation failed, so no group will ever show up
+    if state.get("activation_error"):
+        logger.info("Activation of event %s failed: %s", event_id, state["activation_error"])
+        state["bot_response"] = (
+            f"❌ No se pudo activar el evento {event_id}, así que el grupo de WhatsApp "
+            "no se generó. Intenta crear el evento de nuevo."
+        )
+        state["current_step"] = "error"
+        state["processing_status"] = "error"
+        state["messages"] = AIMessage(state["bot_response"], additional_kwargs={"llm": "group_status_checker"})
+        return state
 
     try:
-        # Step 1: Ask LLM if we should check status
-        decision = _should_check_status(user_message, event_id, state.get("processing_status"))
+        # Step 1: Ask LLM if we should check status, fetching the status from
+        # the API at the same time so the common "yes" path doesn't wait twice
+        status_task = asyncio.create_task(_get_group_status(lukia_service, event_id))
+        try:
+            decision = await _should_check_status(user_message, event_id, state.get("processing_status"))
+        except BaseException:
+            status_task.cancel()
+            raise
 
-        if decision.get("should_check", True) and event_id:
+        if decision.get("should_check", True):
             # Step 2: Get status from API
-            status_result, group_link, error_message = await _get_group_status(lukia_service, event_id)
+            status_result, group_link, _ = await status_task
 
             # Step 3: Update state if group is ready
             if status_result == "ready":
                 state["whatsapp_group_url"] = group_link
                 state["came_from_status_check"] = True
 
-            # Step 4: Generate human response
-            response_data = _generate_status_response(
-                user_message, event_id, status_result, group_link, error_message
-            )
+            # Step 4: Pick the response the LLM wrote for this result
+            response_data = _render_status_response(decision, status_result, group_link)
 
             # Apply response to state
             state["bot_response"] = response_data.get("bot_response", "Estado consultado.")
             state["current_step"] = response_data.get("current_step", "wait")
             state["processing_status"] = response_data.get("processing_status", "pending")
 
-            logger.info(f"✅ Status check result: {status_result} - {state['current_step']}")
+            logger.info("✅ Status check result: %s - %s", status_result, state['current_step'])
 
         else:
-            # LLM decided not to check or no event_id available
-            state["bot_response"] = decision.get("bot_response", "Para consultar el estado, necesito el ID del evento. ¿Podrías proporcionármelo?")
+            # LLM decided not to check
+            status_task.cancel()
+            state["bot_response"] = decision.get("bot_response", "¿Quieres que consulte el estado de tu grupo?")
             state["current_step"] = decision.get("next_step", "wait")
             state["processing_status"] = decision.get("processing_status", "pending")
 
@@ -235,7 +236,7 @@ async def group_status_checker_node(state: ConversationState, lukia_service: Luk
         state["messages"] = AIMessage(state["bot_response"], additional_kwargs={"llm": "group_status_checker"})
 
     except Exception as e:
-        logger.error(f"Unexpected error in status checker: {e}")
+        logger.error("Unexpected error in status checker: %s", e)
         state["bot_response"] = "No puedo consultar el estado en este momento. Intenta más tarde."
         state["current_step"] = "error"
         state["processing_status"] = "error"
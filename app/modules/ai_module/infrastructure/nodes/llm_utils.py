@@ -0,0 +1,101 @@
+"""
+Shared helpers for handling LLM output in the graph nodes
+"""
+
+import json
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+from langchain_core.messages import AIMessage
+
+from app.modules.ai_module.infrastructure import llm_cache
+from app.modules.ai_module.infrastructure.openai_client import get_async_openai
+
+logger = logging.getLogger(__name__)
+
+_DECODER = json.JSONDecoder()
+
+
+def json_schema_format(name: str, properties: Dict[str, Any]) -> dict:
+    """Build a strict Responses API text format for an object with these properties"""
+    return {
+        "format": {
+            "type": "json_schema",
+            "name": name,
+            "strict": True,
+            "schema": {
+                "type": "object",
+                "properties": properties,
+                "required": list(properties),
+                "additionalProperties": False,
+            },
+        }
+    }
+
+
+def parse_llm_json(content: str, fallback: dict) -> dict:
+    """Parse the JSON object in an LLM response, returning fallback if there is none"""
+    try:
+        obj = orjson.loads(content)
+        if isinstance(obj, dict):
+            return obj
+    except orjson.JSONDecodeError:
+        pass
+
+    # The model sometimes wraps the object in prose; decode from the first brace.
+    # orjson has no raw_decode, so this rare path uses the stdlib decoder
+    start = content.find("{")
+    if start < 0:
+        logger.debug("LLM response has no JSON object, using fallback")
+        return fallback
+    try:
+        obj, _ = _DECODER.raw_decode(content, start)
+    except json.JSONDecodeError as e:
+        logger.debug("LLM parse error, using fallback: %s", e)
+        return fallback
+    return obj if isinstance(obj, dict) else fallback
+
+
+def log_prompt_cache_usage(response: Any, llm_tag: str) -> None:
+    """Log how many prompt tokens OpenAI served from its prefix cache"""
+    usage = getattr(response, "usage", None)
+    details = getattr(usage, "input_tokens_details", None)
+    if details is not None:
+        logger.debug(
+            "%s prompt tokens: %s, cached: %s",
+            llm_tag,
+            usage.input_tokens,
+            details.cached_tokens,
+        )
+
+
+async def run_llm_json(
+    messages: List[Dict[str, Any]],
+    *,
+    text_format: dict,
+    ttl: float,
+    fallback: dict,
+    llm_tag: str,
+    model: str = "gpt-5-mini",
+    cache_messages: Optional[List[Dict[str, Any]]] = None,
+) -> Tuple[dict, AIMessage]:
+    """Run a cached, schema-constrained LLM call and parse its JSON answer
+
+    Returns the parsed response (or fallback) and the raw output wrapped as an
+    AIMessage tagged with llm_tag, ready to append to the conversation.
+    """
+    response = await llm_cache.cached_responses_create(
+        get_async_openai(),
+        model=model,
+        messages=messages,
+        text=text_format,
+        ttl=ttl,
+        cache_messages=cache_messages,
+    )
+    log_prompt_cache_usage(response, llm_tag)
+    content = response.output_text
+    return (
+        parse_llm_json(content, fallback),
+        AIMessage(content=content, additional_kwargs={"llm": llm_tag}),
+    )
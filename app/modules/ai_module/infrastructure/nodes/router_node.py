@@ -2,19 +2,27 @@
 Router node for campaign bot - handles conversation flow with LLM
 """
 
+import asyncio
 import logging
-import json
 import re
-import traceback
-from openai import OpenAI
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+import orjson
 from langchain_core.messages import AIMessage
 
+from app.modules.ai_module.infrastructure import llm_cache
 from app.modules.ai_module.infrastructure.conversation_state import ConversationState
+from app.modules.ai_module.infrastructure.nodes.llm_utils import (
+    json_schema_format,
+    log_prompt_cache_usage,
+    parse_llm_json,
+)
+from app.modules.ai_module.infrastructure.openai_client import get_async_openai
 
 logger = logging.getLogger(__name__)
-client = OpenAI()
 
-ROUTER_PROMPT = """
+ROUTER_PROMPT_STATIC = """
 Eres LukiaBot, un agente especializado en campañas de marketing con eventos y grupos de WhatsApp.
 
 ##Presentacion
@@ -39,11 +47,6 @@ IMPORTANTE: Si el usuario pregunta sobre temas que NO están relacionados con:
 Debes responder educadamente que tu función es específica para la gestión de campañas y eventos, y redirigir la conversación hacia esos temas.
 Responde siempre en español
 
-Estado actual del usuario:
-- Paso: {current_step}
-- Mensaje: "{user_message}"
-- Datos recolectados: {collected_data}
-
 ANÁLISIS DEL CONTEXTO:
 1. ¿El mensaje está relacionado con campañas/eventos/WhatsApp? Si NO -> responder fuera de contexto
 2. ¿El usuario quiere consultar el estado de un evento/grupo? Si SÍ -> enviar a verificación de estado
@@ -120,12 +123,12 @@ deja que el LLM intente resolver entradas variadas (frases completas, abreviatur
 
 ##Ejemplos
 Ejemplo de salida esperada con estilo conversacional:
-{{
+{
     "next_step": "paso_siguiente|completed|check_status|out_of_context",
     "bot_response": "Perfecto, campaña registrada ✅ Ahora dime, ¿cómo se llama tu evento?",
     "processing_status": "idle|creating_campaign|checking_status|out_of_context",
     "is_campaign_related": true/false,
-    "parsed": {{
+    "parsed": {
         "campaign_name": "campaña número 1",
         "event_name": "evento de navidad",
         "event_date": "2025-08-22T05:40:37.371Z",
@@ -134,8 +137,8 @@ Ejemplo de salida esperada con estilo conversacional:
         "context": "Campaña navideña con evento especial para diciembre",
         "event_id": "evento123",
         "user_confirms": true/false
-    }}
-}}
+    }
+}
 ##Notas
 NOTA: Si no hay datos nuevos que extraer, devuelve `parsed` con valores nulos o vacíos.
 Si el usuario consulta el link de WhatsApp o message group o enlace, extrae el event_id si lo proporciona y devuelve next_step="check_status"
@@ -144,158 +147,354 @@ El código solo aplicará limpiezas ligeras por seguridad (p. ej. extraer dígit
 """
 
 
-def router_node(state: ConversationState) -> dict:
+_NULLABLE_STRING = {"type": ["string", "null"]}
+
+ROUTER_TEXT_FORMAT = json_schema_format(
+    "router",
+    {
+        "next_step": {"type": "string"},
+        "bot_response": {"type": "string"},
+        "processing_status": {
+            "type": "string",
+            "enum": ["idle", "creating_campaign", "checking_status", "out_of_context"],
+        },
+        "is_campaign_related": {"type": "boolean"},
+        "parsed": {
+            "type": "object",
+            "properties": {
+                "campaign_name": _NULLABLE_STRING,
+                "event_name": _NULLABLE_STRING,
+                "event_date": _NULLABLE_STRING,
+                "timezone": _NULLABLE_STRING,
+                "admins": {"type": ["array", "null"], "items": {"type": "string"}},
+                "context": _NULLABLE_STRING,
+                "event_id": _NULLABLE_STRING,
+                "user_confirms": {"type": ["boolean", "null"]},
+            },
+            "required": [
+                "campaign_name",
+                "event_name",
+                "event_date",
+                "timezone",
+                "admins",
+                "context",
+                "event_id",
+                "user_confirms",
+            ],
+            "additionalProperties": False,
+        },
+    },
+)
+
+_PHONE_RE = re.compile(r"\+?\d{7,15}")
+
+
+# State fields shown to the router as the data collected so far
+_COLLECTED_FIELDS = (
+    "campaign_id",
+    "event_id",
+    "campaign_name",
+    "event_name",
+    "event_date",
+    "timezone",
+    "admins",
+    "context",
+)
+
+
+@lru_cache(maxsize=1024)
+def _encode_collected(snapshot: tuple) -> str:
+    """Serialize a snapshot of the collected fields; most turns repeat the last one"""
+    return orjson.dumps(dict(zip(_COLLECTED_FIELDS, snapshot, strict=True))).decode()
+
+
+def _collected_data_json(state: ConversationState) -> str:
+    """JSON of the data collected so far, encoded once per distinct snapshot"""
+    snapshot = tuple(
+        tuple(value) if isinstance(value, list) else value
+        for value in map(state.get, _COLLECTED_FIELDS)
+    )
+    return _encode_collected(snapshot)
+
+
+def _router_context(current_step: str, user_message: str, collected_json: str) -> str:
+    """Per-turn context message sent after the static router prompt"""
+    return (
+        "\nEstado actual del usuario:\n"
+        f"- Paso: {current_step}\n"
+        f'- Mensaje: "{user_message}"\n'
+        f"- Datos recolectados: {collected_json}\n"
+    )
+
+
+# Used when the router returns no output, e.g. on a refusal
+_FALLBACK_OOC = {
+    "next_step": "out_of_context",
+    "bot_response": (
+        "Disculpa, no entendí completamente tu mensaje. "
+        "Soy un asistente para crear campañas y eventos; si quieres, podemos empezar una campaña."
+    ),
+    "processing_status": "out_of_context",
+    "is_campaign_related": False,
+}
+
+# Steps where users mostly send short stock phrases ("hola", "sí", "listo"),
+# so identical turns can reuse the router's previous answer
+_CACHEABLE_STEPS = frozenset({"greeting", "confirmation"})
+_CACHEABLE_MAX_LENGTH = 32
+_ROUTER_CACHE_TTL = 600
+
+# Steps simple enough for the smaller model; extraction steps keep the default
+_DEFAULT_MODEL = "gpt-5-mini"
+_MODEL_BY_STEP = {
+    "greeting": "gpt-5-nano",
+    "confirmation": "gpt-5-nano",
+    "out_of_context": "gpt-5-nano",
+}
+
+# Router calls in flight per cache key, shared by identical concurrent turns
+_inflight: Dict[str, asyncio.Task] = {}
+
+# Unambiguous replies at the confirmation step, compared after normalize_text
+_CONFIRM_TOKENS = frozenset(
+    {"si", "ok", "dale", "hazlo", "listo", "correcto", "perfecto", "adelante", "confirmo"}
+)
+_DECLINE_TOKENS = frozenset({"no", "espera", "cambia", "cancelar"})
+# Bare greetings at the greeting step, which carry no campaign data
+_GREETING_TOKENS = frozenset(
+    {"hola", "buenas", "buenos dias", "buenas tardes", "buenas noches", "hey", "hi", "hello"}
+)
+
+# Router decisions the prompt fully specifies, applied without calling the LLM
+_GREETING_RESULT = {
+    "next_step": "campaign_name",
+    "bot_response": (
+        "¡Hola! Soy LukiaBot, Te ayudo a armar tu campaña y obtener enlaces de WhatsApp "
+        "en minutos. ¿Cómo se llama tu campaña?"
+    ),
+    "processing_status": "idle",
+    "is_campaign_related": True,
+    "parsed": {},
+}
+_CONFIRM_RESULT = {
+    "next_step": "confirmation",
+    "bot_response": "Perfecto ✅",
+    "processing_status": "idle",
+    "is_campaign_related": True,
+    "parsed": {"user_confirms": True},
+}
+_DECLINE_RESULT = {
+    "next_step": "confirmation",
+    "bot_response": "Ok, dime qué cambio.",
+    "processing_status": "idle",
+    "is_campaign_related": True,
+    "parsed": {"user_confirms": False},
+}
+
+
+def _router_cache_key(current_step: str, user_message: str, collected_json: str) -> Optional[str]:
+    """Cache key for this turn, or None when the answer must not be reused"""
+    if current_step not in _CACHEABLE_STEPS or len(user_message) >= _CACHEABLE_MAX_LENGTH:
+        return None
+    return llm_cache.make_key(
+        "router", [current_step, llm_cache.normalize_text(user_message), collected_json]
+    )
+
+
+async def _create_router_response(
+    model: str, current_step: str, user_message: str, collected_json: str
+) -> Any:
+    """Send one router request to the given model"""
+    return await get_async_openai().responses.create(
+        model=model,
+        input=[
+            {"role": "system", "content": ROUTER_PROMPT_STATIC},
+            {
+                "role": "system",
+                "content": _router_context(current_step, user_message, collected_json),
+            },
+            {"role": "user", "content": user_message},
+        ],
+        text=ROUTER_TEXT_FORMAT,
+        #temperature=0.1,
+    )
+
+
+async def _call_router_llm(current_step: str, user_message: str, collected_json: str) -> str:
+    """Ask the router LLM for the next step and return its raw output"""
+    model = _MODEL_BY_STEP.get(current_step, _DEFAULT_MODEL)
+    response = await _create_router_response(model, current_step, user_message, collected_json)
+    log_prompt_cache_usage(response, "router")
+
+    # The small model's answer is only kept if it is a usable JSON object
+    if model != _DEFAULT_MODEL and not parse_llm_json(response.output_text, {}):
+        logger.info("Router %s output unusable, retrying with %s", model, _DEFAULT_MODEL)
+        response = await _create_router_response(
+            _DEFAULT_MODEL, current_step, user_message, collected_json
+        )
+        log_prompt_cache_usage(response, "router")
+    return response.output_text
+
+
+async def _call_router_llm_coalesced(
+    cache_key: str, current_step: str, user_message: str, collected_json: str
+) -> str:
+    """Like _call_router_llm, but identical concurrent turns await a single call"""
+    task = _inflight.get(cache_key)
+    if task is None:
+        task = asyncio.create_task(
+            _call_router_llm(current_step, user_message, collected_json)
+        )
+        _inflight[cache_key] = task
+        task.add_done_callback(lambda _: _inflight.pop(cache_key, None))
+    # Shielded so one caller being cancelled does not cancel the others' call
+    return await asyncio.shield(task)
+
+
+def _fast_path_result(current_step: str, user_message: str) -> Optional[dict]:
+    """Router decision for turns the prompt fully determines, or None to ask the LLM"""
+    token = llm_cache.normalize_text(user_message)
+    if current_step == "greeting" and token in _GREETING_TOKENS:
+        return _GREETING_RESULT
+    if current_step == "confirmation":
+        if token in _CONFIRM_TOKENS:
+            return _CONFIRM_RESULT
+        if token in _DECLINE_TOKENS:
+            return _DECLINE_RESULT
+    return None
+
+
+# Parsed text fields, each collected at the conversation step of the same name
+_PARSED_TEXT_FIELDS = ("campaign_name", "event_name", "event_date", "timezone", "context")
+# Fields that must be filled before a confirmation starts campaign creation
+_REQUIRED_FIELDS = _PARSED_TEXT_FIELDS + ("admins",)
+
+
+def _clean(value: Any) -> Any:
+    """Strip a parsed value, returning None when it carries no data"""
+    if value is None:
+        return None
+    if isinstance(value, list):
+        cleaned = [item for item in (str(v).strip() for v in value) if item]
+        return cleaned or None
+    cleaned = value.strip() if isinstance(value, str) else str(value).strip()
+    return cleaned or None
+
+
+def _apply_router_result(
+    state: ConversationState, llm_res: dict, current_step: str, user_message: str
+) -> None:
+    """Update the conversation state from a router decision"""
+    get = llm_res.get
+    updates: dict = {}
+
+    # Check if message is campaign-related
+    if not get("is_campaign_related", True):
+        # Handle out-of-context messages
+        updates["current_step"] = "out_of_context"
+        updates["bot_response"] = get(
+            "bot_response",
+            "Disculpa, soy un asistente especializado en la creación de campañas con eventos y grupos de WhatsApp. "
+            "¿Te gustaría crear una campaña? Puedo ayudarte con eso.",
+        )
+        updates["processing_status"] = "out_of_context"
+        state.update(updates)
+        logger.info("❌ Message out of context - redirecting to campaign topics")
+        return
+
+    # Update state based on LLM decision for campaign-related messages
+    updates["current_step"] = get("next_step", current_step)
+    updates["bot_response"] = get("bot_response", "¿Cómo puedo ayudarte?")
+
+    llm_processing_status = get("processing_status", "idle")
+    if llm_processing_status in ("checking_status", "out_of_context"):
+        updates["processing_status"] = llm_processing_status
+
+    # Use parsed data from LLM when available (preferred)
+    parsed = get("parsed") or {}
+
+    # Text fields: trust LLM parsed values first; when collecting that
+    # field, fall back to the raw message
+    message = user_message.strip()
+    for field in _PARSED_TEXT_FIELDS:
+        value = _clean(parsed.get(field))
+        if value is not None:
+            updates[field] = value
+        elif current_step == field and message:
+            updates[field] = message
+
+    # Admins: trust LLM to extract and clean phone numbers
+    admins = _clean(parsed.get("admins"))
+    if admins is not None:
+        updates["admins"] = admins if isinstance(admins, list) else [admins]
+    elif current_step == "admins" and message:
+        # Fallback: extract phone numbers if LLM didn't parse
+        updates["admins"] = _PHONE_RE.findall(user_message) or [message]
+
+    # Confirmation - let LLM interpret if user is confirming
+    user_confirms = parsed.get("user_confirms")
+    if user_confirms is not None:
+        if user_confirms:
+            # Check if all required data is present, counting this turn's values
+            collected = {**state, **updates}
+            if all(collected.get(field) for field in _REQUIRED_FIELDS):
+                updates["processing_status"] = "creating_campaign"
+                logger.info("🚀 All data complete - starting campaign creation")
+            else:
+                updates["bot_response"] = "Faltan algunos datos. Te ayudo a completarlos."
+                updates["processing_status"] = "idle"
+        else:
+            # User did not confirm - stay in current step or go back
+            updates["processing_status"] = "idle"
+
+    # Event ID for status checking
+    event_id = parsed.get("event_id")
+    if event_id:
+        updates["event_id"] = str(event_id).strip()
+
+    state.update(updates)
+    logger.info("✅ Router -> %s: %s...", updates["current_step"], updates["bot_response"][:50])
+
+
+async def router_node(state: ConversationState) -> dict:
     """Routes conversation using LLM intelligence"""
     current_step = state.get("current_step", "greeting")
     user_message = state.get("user_message", "")
 
-    logger.info(f"🔄 Router: {current_step} - '{user_message[:50]}'")
+    logger.info("🔄 Router: %s - '%s'", current_step, user_message[:50])
+
+    llm_res = _fast_path_result(current_step, user_message)
+    if llm_res is not None:
+        logger.info("⚡ Router fast path for step %s", current_step)
+        _apply_router_result(state, llm_res, current_step, user_message)
+        state["messages"] = AIMessage(
+            state["bot_response"], additional_kwargs={"llm": "router_fast_path"}
+        )
+        return state
 
     # Prepare collected data for LLM
-    collected_data = {
-        "campaign_id": state.get("campaign_id"),
-        "event_id": state.get("event_id"),
-        "campaign_name": state.get("campaign_name"),
-        "event_name": state.get("event_name"),
-        "event_date": state.get("event_date"),
-        "timezone": state.get("timezone"),
-        "admins": state.get("admins"),
-        "context": state.get("context"),
-    }
+    collected_json = _collected_data_json(state)
 
     try:
-        response = client.responses.create(
-            model="gpt-5-mini",
-            input=[
-                {
-                    "role": "system",
-                    "content": ROUTER_PROMPT.format(
-                        current_step=current_step,
-                        user_message=user_message,
-                        collected_data=json.dumps(collected_data, ensure_ascii=False),
-                    ),
-                },
-                {"role": "user", "content": user_message},
-            ],
-            #temperature=0.1,
-        )
+        cache_key = _router_cache_key(current_step, user_message, collected_json)
+        content = llm_cache.lookup(cache_key) if cache_key else None
+        if content is None and cache_key:
+            content = await _call_router_llm_coalesced(
+                cache_key, current_step, user_message, collected_json
+            )
+            if content:
+                llm_cache.store(cache_key, content, _ROUTER_CACHE_TTL)
+        elif content is None:
+            content = await _call_router_llm(current_step, user_message, collected_json)
 
-        content = response.output_text
         state["messages"] = AIMessage(content, additional_kwargs={"llm": "router"})
-        # logger.info(f"Router LLM raw response: {content}")
-        try:
-            llm_res = json.loads(content)
-        except Exception:
-            llm_res = {
-                "next_step": "out_of_context",
-                "bot_response": (
-                    "Disculpa, no entendí completamente tu mensaje. "
-                    "Soy un asistente para crear campañas y eventos; si quieres, podemos empezar una campaña."
-                ),
-                "processing_status": "out_of_context",
-                "is_campaign_related": False,
-            }
-
-        # Check if message is campaign-related
-        is_campaign_related = llm_res.get("is_campaign_related", True)
-
-        if not is_campaign_related:
-            # Handle out-of-context messages
-            state["current_step"] = "out_of_context"
-            state["bot_response"] = llm_res.get(
-                "bot_response",
-                "Disculpa, soy un asistente especializado en la creación de campañas con eventos y grupos de WhatsApp. "
-                "¿Te gustaría crear una campaña? Puedo ayudarte con eso.",
-            )
-            state["processing_status"] = "out_of_context"
-            logger.info("❌ Message out of context - redirecting to campaign topics")
-        else:
-            # Update state based on LLM decision for campaign-related messages
-            state["current_step"] = llm_res.get("next_step", current_step)
-            state["bot_response"] = llm_res.get("bot_response", "¿Cómo puedo ayudarte?")
-
-            llm_processing_status = llm_res.get("processing_status", "idle")
-            if llm_processing_status in ["checking_status", "out_of_context"]:
-                state["processing_status"] = llm_processing_status
-
-            # Use parsed data from LLM when available (preferred)
-            parsed = llm_res.get("parsed", {}) or {}
-
-            # Campaign name & event name & date: trust LLM parsed values first; minimal fallback to raw message
-            if parsed.get("campaign_name"):
-                state["campaign_name"] = str(parsed.get("campaign_name")).strip()
-            elif current_step == "campaign_name" and user_message.strip():
-                state["campaign_name"] = user_message.strip()
-
-            if parsed.get("event_name"):
-                state["event_name"] = str(parsed.get("event_name")).strip()
-            elif current_step == "event_name" and user_message.strip():
-                state["event_name"] = user_message.strip()
-
-            if parsed.get("event_date"):
-                state["event_date"] = str(parsed.get("event_date")).strip()
-            elif current_step == "event_date" and user_message.strip():
-                state["event_date"] = user_message.strip()
-
-            # Timezone
-            if parsed.get("timezone"):
-                state["timezone"] = str(parsed.get("timezone")).strip()
-            elif current_step == "timezone" and user_message.strip():
-                state["timezone"] = user_message.strip()
-
-            # Admins: trust LLM to extract and clean phone numbers
-            if parsed.get("admins"):
-                admins_parsed = parsed.get("admins")
-                if isinstance(admins_parsed, list):
-                    state["admins"] = [str(a).strip() for a in admins_parsed]
-                else:
-                    state["admins"] = [str(admins_parsed).strip()]
-            elif current_step == "admins" and user_message.strip():
-                # Fallback: extract phone numbers if LLM didn't parse
-                nums = re.findall(r"\+?\d{7,15}", user_message)
-                if nums:
-                    state["admins"] = nums
-                else:
-                    state["admins"] = [user_message.strip()]
-
-            # Context
-            if parsed.get("context"):
-                state["context"] = str(parsed.get("context")).strip()
-            elif current_step == "context" and user_message.strip():
-                state["context"] = user_message.strip()
-
-            # Confirmation - let LLM interpret if user is confirming
-            if parsed.get("user_confirms") is not None:
-                user_confirms = parsed.get("user_confirms")
-                if user_confirms:
-                    # Check if all required data is present
-                    required_data = [
-                        state.get("campaign_name"),
-                        state.get("event_name"),
-                        state.get("event_date"),
-                        state.get("timezone"),
-                        state.get("admins"),
-                        state.get("context")
-                    ]
-                    if all(required_data):
-                        state["processing_status"] = "creating_campaign"
-                        logger.info("🚀 All data complete - starting campaign creation")
-                    else:
-                        state["bot_response"] = "Faltan algunos datos. Te ayudo a completarlos."
-                        state["processing_status"] = "idle"
-                else:
-                    # User did not confirm - stay in current step or go back
-                    state["processing_status"] = "idle"
-
-            # Event ID for status checking
-            if parsed.get("event_id"):
-                state["event_id"] = str(parsed.get("event_id")).strip()
-
-            logger.info(f"✅ Router -> {state['current_step']}: {state['bot_response'][:50]}...")
-
-    except Exception as e:
-        logger.error(traceback.format_exc())
-        logger.error(f"❌ Router LLM error: {e}")
+        # logger.info("Router LLM raw response: %s", content)
+        llm_res = parse_llm_json(content, _FALLBACK_OOC)
+
+        _apply_router_result(state, llm_res, current_step, user_message)
+
+    except Exception:
+        logger.exception("❌ Router LLM error")
         state["bot_response"] = "Ocurrió un error. ¿Puedes repetir tu mensaje?"
 
     return state
@@ -1,45 +1,53 @@
 """
-WhatsApp group creator node - handles WhatsApp group creation with LLM intelligence
+WhatsApp group creator node - activates the event so its WhatsApp group is generated
 """
 
-import json
 import logging
-import traceback
-from openai import OpenAI
+from typing import Awaitable, Callable, Optional
 from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableConfig
 
 from app.modules.ai_module.infrastructure.conversation_state import ConversationState
 from app.modules.campaign_module.application.campaign_service import LukiaService
 
 logger = logging.getLogger(__name__)
-client = OpenAI()
 
-WHATSAPP_CREATOR_PROMPT = """
-Eres el activador de grupos de WhatsApp. Tu trabajo es activar el evento para que se genere el grupo.
+ACTIVATION_SCHEDULED_RESPONSE = (
+    "⏳ Estoy activando tu evento. "
+    "El grupo de WhatsApp se generará en segundo plano; "
+    "en unos momentos podrás consultar su estado y el enlace."
+)
 
-Información disponible:
-- Event ID: {event_id}
 
-Análisis simple:
-1. Si hay event_id válido -> activar evento (esto genera el grupo automáticamente)
-2. Si no hay event_id -> reportar error
-
-El servicio activate_event() solo necesita el event_id y se encarga de todo el proceso de creación del grupo.
-
-Responde SOLO con JSON:
-{{
-  "should_activate": true/false,
-  "bot_response": "mensaje al usuario sobre la activación",
-  "next_step": "pending_group|error",
-  "processing_status": "completed|error"
-}}
-"""
+async def _activate_event(
+    lukia_service: LukiaService,
+    event_id: str,
+    on_done: Callable[[Optional[str]], Awaitable[None]],
+) -> None:
+    """Activates the event in the background and hands the error (or None) to on_done"""
+    error: Optional[str] = None
+    try:
+        response = await lukia_service.activate_event(event_id)
+        logger.info("Event activation response: %s", response)
+    except Exception as e:
+        logger.exception("❌ Background event activation failed for %s", event_id)
+        error = str(e)
+    try:
+        await on_done(error)
+    except Exception:
+        logger.exception("❌ Could not record activation outcome for %s", event_id)
 
 
-async def whatsapp_group_creator_node(state: ConversationState, lukia_service: LukiaService) -> dict:
+async def whatsapp_group_creator_node(
+    state: ConversationState,
+    config: RunnableConfig,
+    lukia_service: LukiaService,
+    spawn: Callable,
+    record_activation: Callable[[str, str, Optional[str]], Awaitable[None]],
+) -> dict:
     """Activates event to trigger WhatsApp group creation"""
     event_id = state.get("event_id")
-    logger.info(f"💬 Activating event {event_id} to create WhatsApp group")
+    logger.info("💬 Activating event %s to create WhatsApp group", event_id)
     # If prior node failed or event_id missing, fail fast and report error
     if state.get("processing_status") != "creating_group" or not event_id:
         logger.info("WhatsApp creator skipped because prior step failed or event_id missing")
@@ -48,57 +56,31 @@ async def whatsapp_group_creator_node(state: ConversationState, lukia_service: L
         state["processing_status"] = "error"
         return state
     try:
-        # Ask LLM for guidance
-        response = client.responses.create(
-            model="gpt-5-mini",
-            input=[
-                {"role": "system", "content": WHATSAPP_CREATOR_PROMPT.format(
-                    event_id=event_id
-                )},
-                {"role": "user", "content": f"Activar evento {event_id} para generar grupo WhatsApp"}
-            ],
-            #temperature=0.1
-        )
+        # Activate event - this triggers WhatsApp group creation automatically.
+        # Run it off the request path; the user polls the group status, which
+        # sees the outcome the task records once activation finishes.
+        thread_id = config["configurable"]["thread_id"]
 
-        # Robust parse for LLM JSON response
-        content = response.output_text
-        state["messages"] = AIMessage(content, additional_kwargs={"llm": "whatsapp_group_creator"})
-        try:
-            llm_response = json.loads(content)
-        except Exception:
-            try:
-                start = content.index("{")
-                end = content.rindex("}") + 1
-                llm_response = json.loads(content[start:end])
-            except Exception as e:
-                logger.debug(f"WhatsAppCreator LLM parse error, fallback: {e}")
-                llm_response = {"should_activate": True, "bot_response": "Activando evento para generar grupo.", "next_step": "pending_group", "processing_status": "completed"}
+        async def on_done(error: Optional[str]) -> None:
+            await record_activation(thread_id, event_id, error)
 
-        if llm_response.get("should_activate", True) and event_id:
-            # Activate event - this triggers WhatsApp group creation automatically
-            response = await lukia_service.activate_event(event_id)
-            logger.info(f"Event activation response: {response}")
-            
-            # Record pending event id so status can be checked later
-            state["pending_event_id"] = event_id
+        spawn(_activate_event(lukia_service, event_id, on_done))
 
-            # Use LLM response if available, otherwise fallback to default message
-            state["bot_response"] = llm_response.get("bot_response", 
-                "✅ Evento activado correctamente. "
-                "El grupo de WhatsApp se está generando en segundo plano. "
-                "En unos momentos estará listo y podrás consultar el enlace."
-            )
-            state["current_step"] = llm_response.get("next_step", "pending_group")
-            state["processing_status"] = llm_response.get("processing_status", "completed")
-            logger.info("✅ Event activated - WhatsApp group creation in progress")
-        else:
-            state["bot_response"] = llm_response.get("bot_response", "Error en creación de grupo")
-            state["current_step"] = llm_response.get("next_step", "error")
-            state["processing_status"] = llm_response.get("processing_status", "error")
+        # Record pending event id so status can be checked later
+        state["pending_event_id"] = event_id
+        state["activation_error"] = None
+
+        state["bot_response"] = ACTIVATION_SCHEDULED_RESPONSE
+        state["current_step"] = "pending_group"
+        state["processing_status"] = "creating"
+        state["messages"] = AIMessage(
+            ACTIVATION_SCHEDULED_RESPONSE,
+            additional_kwargs={"llm": "whatsapp_group_creator_static"},
+        )
+        logger.info("⏳ Event activation scheduled - WhatsApp group creation in progress")
 
     except Exception as e:
-        logger.error(traceback.format_exc())
-        logger.error(f"❌ WhatsApp creation error: {e}")
+        logger.exception("❌ WhatsApp creation error")
         state["bot_response"] = f"❌ Error creando grupo: {str(e)}"
         state["current_step"] = "error"
         state["processing_status"] = "error"
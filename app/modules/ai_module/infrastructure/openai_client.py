@@ -0,0 +1,32 @@
+"""
+Shared OpenAI client for all graph nodes
+"""
+
+from functools import lru_cache
+
+import httpx
+from openai import AsyncOpenAI
+
+
+@lru_cache(maxsize=1)
+def get_async_openai() -> AsyncOpenAI:
+    """Return the process-wide AsyncOpenAI client, creating it on first use
+
+    One HTTP/2 connection pool to api.openai.com serves every node, so
+    concurrent conversations multiplex over warm connections instead of each
+    module holding its own pool.
+    """
+    return AsyncOpenAI(
+        http_client=httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=200, max_keepalive_connections=100),
+            timeout=httpx.Timeout(60.0, connect=5.0),
+        )
+    )
+
+
+async def aclose() -> None:
+    """Close the shared client if it was ever created"""
+    if get_async_openai.cache_info().currsize:
+        await get_async_openai().close()
+        get_async_openai.cache_clear()
@@ -4,6 +4,8 @@ import asyncio
 from typing import List, Optional
 from datetime import datetime, timezone
 
+from dateutil import parser as date_parser
+
 from app.core.config.settings import settings
 from app.modules.campaign_module.domain.exceptions import (
     ExternalAPIError,
@@ -17,7 +19,10 @@ from app.modules.campaign_module.domain.models import (
     EventInput,
     MessageGroup,
 )
-from app.modules.campaign_module.infrastructure.lukia_api_client import LukiaAPIClient
+from app.modules.campaign_module.infrastructure.lukia_api_client import (
+    LukiaAPIClient,
+    get_lukia_api_client,
+)
 import uuid
 logger = logging.getLogger(__name__)
 
@@ -26,7 +31,7 @@ class LukiaService:
     """Service for campaign management operations."""
 
     def __init__(self, api_client: LukiaAPIClient = None):
-        self.api_client = api_client or LukiaAPIClient()
+        self.api_client = api_client or get_lukia_api_client()
 
     async def create_campaign_with_defaults(self, name: str) -> Campaign:
         """Create a campaign with default company and integration."""
@@ -52,36 +57,27 @@ class LukiaService:
         base_date = event_date
         # Allow event_date passed as string: try to parse into datetime
         if isinstance(event_date, str):
-            parsed = None
-            # Try ISO format first
+            # Try ISO format first (C fast path), then a single lenient parse
+            # that also covers day-first dates like "15/10/2025 14:30"
             try:
                 parsed = datetime.fromisoformat(event_date)
-            except Exception:
-                # Try common formats
-                for fmt in ("%Y-%m-%d %H:%M", "%Y-%m-%d", "%d/%m/%Y %H:%M", "%d/%m/%Y"):
-                    try:
-                        parsed = datetime.strptime(event_date, fmt)
-                        break
-                    except Exception as exc:
-                        logger.debug(
-                            "create_event_for_campaign: failed to parse '%s' with fmt %s: %s",
-                            event_date,
-                            fmt,
-                            exc,
-                        )
-            if parsed is None:
-                raise InvalidEventDate(f"Invalid event_date format: {event_date}")
+            except ValueError:
+                try:
+                    parsed = date_parser.parse(event_date, dayfirst=True)
+                except (ValueError, OverflowError) as exc:
+                    raise InvalidEventDate(f"Invalid event_date format: {event_date}") from exc
             event_date = parsed
 
         if event_date.tzinfo is None:
             event_date = event_date.replace(tzinfo=timezone.utc)
-        else:
+        elif event_date.tzinfo is not timezone.utc:
             event_date = event_date.astimezone(timezone.utc)
 
         # Ahora la comparación no rompe
-        if event_date <= datetime.now(timezone.utc):
+        now = datetime.now(timezone.utc)
+        if event_date <= now:
             logger.info(
-                f"create_event_for_campaign: event_date is in the past: {event_date} and {base_date}"
+                "create_event_for_campaign: event_date is in the past: %s and %s", event_date, base_date
             )
             raise InvalidEventDate(
                 "Event date must be in the future",
@@ -142,11 +138,18 @@ class LukiaService:
                 context,
             )
 
-            # Step 3: Activate event
-            event = await self.activate_event(event.id)
-
-            # Step 4: Wait for groups to be created
-            groups = await self.wait_for_group_creation(event.id)
+            # Steps 3 and 4: activate the event and start polling for its
+            # groups together; polling only needs the event id. If
+            # activation fails the poll is cancelled rather than left to
+            # run until its deadline
+            activate_task = asyncio.create_task(self.activate_event(event.id))
+            groups_task = asyncio.create_task(self.wait_for_group_creation(event.id))
+            try:
+                event = await activate_task
+                groups = await groups_task
+            finally:
+                activate_task.cancel()
+                groups_task.cancel()
 
             return campaign, event, groups
 
@@ -157,10 +160,13 @@ class LukiaService:
         self, event_id: str, max_wait_seconds: int = 120
     ) -> List[MessageGroup]:
         """Wait for WhatsApp groups to be created and return them."""
-        wait_interval = 10  # Check every 10 seconds
-        max_attempts = max_wait_seconds // wait_interval
+        # Poll quickly at first and back off, so groups that are ready after
+        # a few seconds are returned right away without hammering the API
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max_wait_seconds
+        delay = 1.0
 
-        for _ in range(max_attempts):
+        while loop.time() < deadline:
             groups = await self.api_client.get_message_groups(event_id)
 
             # Check if any group has a link (is ready)
@@ -170,7 +176,8 @@ class LukiaService:
             if ready_groups:
                 return ready_groups
 
-            await asyncio.sleep(wait_interval)
+            await asyncio.sleep(max(0.0, min(delay, deadline - loop.time())))
+            delay = min(delay * 1.7, 10.0)
 
         # Return groups even if not ready
         return await self.api_client.get_message_groups(event_id)
@@ -1,12 +1,19 @@
 from datetime import datetime
 from typing import Dict, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field
+
+# Shared by every model here: unknown API keys are dropped, the core schema is
+# built on first validation, and fields aliased to the Lukia API's camelCase
+# keys also accept their own name
+_MODEL_CONFIG = ConfigDict(extra="ignore", defer_build=True, populate_by_name=True)
 
 
 class CampaignInput(BaseModel):
     """Input model for creating a campaign."""
 
+    model_config = _MODEL_CONFIG
+
     name: str = Field(..., description="Campaign name")
     company_id: str = Field(..., description="Company ID")
     integration_id: str = Field(..., description="Integration ID")
@@ -18,25 +25,36 @@ class CampaignInput(BaseModel):
 
 class Campaign(BaseModel):
     """Campaign model."""
+
+    model_config = _MODEL_CONFIG
+
     id: Optional[str] = Field(default=None, alias="_id", description="Campaign ID")
     name: str = Field(..., description="Campaign name")
-    company_id: str = Field(..., description="Company ID")
-    integration_id: str = Field(..., description="Integration ID")
+    company_id: str = Field(..., validation_alias="companyId", description="Company ID")
+    integration_id: str = Field(
+        ...,
+        validation_alias=AliasChoices("messagingIntegrationId", "integrationId"),
+        description="Integration ID",
+    )
     external_campaign_id: Optional[str] = Field(
-        default=None, description="External campaign identifier"
+        default=None,
+        validation_alias="externalCampaignId",
+        description="External campaign identifier",
     )
     metadata: Optional[Dict] = Field(default=None, description="Additional metadata")
     created_at: Optional[datetime] = Field(
-        default=None, description="Creation timestamp"
+        default=None, validation_alias="createdAt", description="Creation timestamp"
     )
     updated_at: Optional[datetime] = Field(
-        default=None, description="Last update timestamp"
+        default=None, validation_alias="updatedAt", description="Last update timestamp"
     )
 
 
 class EventInput(BaseModel):
     """Input model for creating an event."""
 
+    model_config = _MODEL_CONFIG
+
     name: str = Field(..., description="Event name")
     campaign_id: str = Field(..., description="Associated campaign ID")
     event_date: datetime = Field(..., description="Event date and time")
@@ -54,42 +72,56 @@ class EventInput(BaseModel):
 class Event(BaseModel):
     """Event model."""
 
+    model_config = _MODEL_CONFIG
+
     id: Optional[str] = Field(default=None, description="Event ID")
     name: str = Field(..., description="Event name")
-    campaign_id: str = Field(..., description="Associated campaign ID")
-    event_date: datetime = Field(..., description="Event date and time")
+    campaign_id: str = Field(
+        ..., validation_alias="campaignId", description="Associated campaign ID"
+    )
+    event_date: datetime = Field(
+        ...,
+        validation_alias=AliasChoices("targetDate", "eventDate"),
+        description="Event date and time",
+    )
     timezone: str = Field(default="America/Bogota", description="Event timezone")
     administrators: List[str] = Field(
-        ..., description="List of administrator phone numbers"
+        ...,
+        validation_alias="admins",
+        description="List of administrator phone numbers",
     )
     image_url: Optional[str] = Field(
-        default=None, description="Event image URL or base64"
+        default=None, validation_alias="imageUrl", description="Event image URL or base64"
     )
     context: Optional[str] = Field(default=None, description="Event context/details")
     metadata: Optional[Dict] = Field(default=None, description="Additional metadata")
     status: str = Field(default="draft", description="Event status")
     created_at: Optional[datetime] = Field(
-        default=None, description="Creation timestamp"
+        default=None, validation_alias="createdAt", description="Creation timestamp"
     )
     updated_at: Optional[datetime] = Field(
-        default=None, description="Last update timestamp"
+        default=None, validation_alias="updatedAt", description="Last update timestamp"
     )
 
 
 class MessageGroup(BaseModel):
     """WhatsApp group model."""
 
+    model_config = _MODEL_CONFIG
+
     id: Optional[str] = Field(default=None, description="Group ID")
-    event_id: str = Field(..., description="Associated event ID")
+    event_id: str = Field(..., validation_alias="eventId", description="Associated event ID")
     external_id: Optional[str] = Field(
-        default=None, description="External WhatsApp group ID"
+        default=None, validation_alias="externalId", description="External WhatsApp group ID"
     )
     link: Optional[str] = Field(default=None, description="WhatsApp group link")
     status: str = Field(default="pending", description="Group status")
     capacity: int = Field(default=0, description="Group capacity")
     current_participants: int = Field(
-        default=0, description="Current number of participants"
+        default=0,
+        validation_alias="currentParticipants",
+        description="Current number of participants",
     )
     created_at: Optional[datetime] = Field(
-        default=None, description="Creation timestamp"
+        default=None, validation_alias="createdAt", description="Creation timestamp"
     )
@@ -1,6 +1,8 @@
 """Telegram bot service."""
 
 import logging
+import re
+from functools import lru_cache
 from typing import Optional
 
 from telegram import Update
@@ -18,12 +20,45 @@ from app.modules.telegram_module.domain.models import TelegramUser
 
 logger = logging.getLogger(__name__)
 
+# URLs and phone numbers, matched in one scan so a number inside a URL is
+# never wrapped separately
+_LINK_OR_PHONE_RE = re.compile(
+    r"(?P<url>https?://[^\s]+)|(?P<phone>\+\d{1,3}\s?\d{3}\s?\d{3}\s?\d{4})"
+)
+
+
+def _format_match(match: re.Match) -> str:
+    """Wrap a URL in a link and a phone number in bold"""
+    value = match.group(0)
+    if match.lastgroup == "url":
+        return f'<a href="{value}">{value}</a>'
+    return f"<b>{value}</b>"
+
+
+@lru_cache(maxsize=4096)
+def _build_telegram_user(
+    user_id: int,
+    first_name: str,
+    last_name: Optional[str],
+    username: Optional[str],
+    language_code: Optional[str],
+) -> TelegramUser:
+    """Build a TelegramUser, reusing the instance for users seen before"""
+    return TelegramUser(
+        user_id=user_id,
+        first_name=first_name,
+        last_name=last_name,
+        username=username,
+        language_code=language_code,
+    )
+
 
 class TelegramBotService:
     """Service for managing Telegram bot interactions."""
 
-    def __init__(self, ai_service: AIService = None):
-        self.ai_service = ai_service or AIService()
+    def __init__(self, ai_service: AIService):
+        # The caller owns ai_service: it must already be started and is closed elsewhere
+        self.ai_service = ai_service
         self.application: Optional[Application] = None
 
     async def initialize(self) -> bool:
@@ -50,7 +85,7 @@ class TelegramBotService:
             return True
 
         except Exception as e:
-            logger.error(f"Failed to initialize Telegram bot: {str(e)}")
+            logger.error("Failed to initialize Telegram bot: %s", e)
             return False
 
     async def start_polling(self) -> None:
@@ -67,7 +102,7 @@ class TelegramBotService:
             await self.application.updater.start_polling()
             logger.info("Telegram bot polling started")
         except Exception as e:
-            logger.error(f"Error during Telegram polling: {str(e)}")
+            logger.error("Error during Telegram polling: %s", e)
 
     async def stop(self) -> None:
         """Stop the Telegram bot."""
@@ -78,17 +113,13 @@ class TelegramBotService:
                 await self.application.shutdown()
                 logger.info("Telegram bot stopped")
             except Exception as e:
-                logger.error(f"Error stopping Telegram bot: {str(e)}")
+                logger.error("Error stopping Telegram bot: %s", e)
 
     def _extract_user_info(self, update: Update) -> TelegramUser:
         """Extract user information from Telegram update."""
         user = update.effective_user
-        return TelegramUser(
-            user_id=user.id,
-            first_name=user.first_name,
-            last_name=user.last_name,
-            username=user.username,
-            language_code=user.language_code,
+        return _build_telegram_user(
+            user.id, user.first_name, user.last_name, user.username, user.language_code
         )
 
     async def _handle_start(
@@ -96,7 +127,7 @@ class TelegramBotService:
     ) -> None:
         """Handle /start command."""
         user = self._extract_user_info(update)
-        logger.info(f"Start command from user {user.user_id}")
+        logger.info("Start command from user %s", user.user_id)
 
         try:
             # Send welcome message
@@ -109,7 +140,7 @@ class TelegramBotService:
             await update.message.reply_text(welcome_text, parse_mode="HTML")
 
         except Exception as e:
-            logger.error(f"Error handling start command: {str(e)}")
+            logger.error("Error handling start command: %s", e)
             await update.message.reply_text(
                 "Lo siento, ocurrió un error. Por favor intenta de nuevo."
             )
@@ -121,7 +152,7 @@ class TelegramBotService:
         user = self._extract_user_info(update)
         message_text = update.message.text
 
-        logger.info(f"Message from user {user.user_id}: {message_text[:50]}...")
+        logger.info("Message from user %s: %s...", user.user_id, message_text[:50])
 
         try:
             response = await self.ai_service.process_user_message(
@@ -136,26 +167,12 @@ class TelegramBotService:
             )
 
         except Exception as e:
-            logger.error(f"Error handling message from user {user.user_id}: {str(e)}")
+            logger.error("Error handling message from user %s: %s", user.user_id, e)
             await update.message.reply_text(
                 "Lo siento, ocurrió un error procesando tu mensaje. Por favor intenta de nuevo."
             )
 
     def _format_response_for_telegram(self, text: str) -> str:
         """Format bot response for Telegram HTML parsing."""
-        # Simple formatting for Telegram HTML
-        # You can enhance this with more sophisticated formatting
-
-        # Make URLs clickable (simple approach)
-        import re
-
-        url_pattern = r"https?://[^\s]+"
-        text = re.sub(
-            url_pattern, lambda m: f'<a href="{m.group(0)}">{m.group(0)}</a>', text
-        )
-
-        # Make phone numbers bold
-        phone_pattern = r"\+\d{1,3}\s?\d{3}\s?\d{3}\s?\d{4}"
-        text = re.sub(phone_pattern, lambda m: f"<b>{m.group(0)}</b>", text)
-
-        return text
+        # Simple formatting for Telegram HTML: clickable URLs, bold phone numbers
+        return _LINK_OR_PHONE_RE.sub(_format_match, text)
@@ -1,38 +1,36 @@
 """Telegram bot models and types."""
 
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel, Field
 
-
-class TelegramUser(BaseModel):
+@dataclass(slots=True, frozen=True)
+class TelegramUser:
     """Telegram user information."""
 
-    user_id: int = Field(..., description="Telegram user ID")
-    first_name: str = Field(..., description="User's first name")
-    last_name: Optional[str] = Field(default=None, description="User's last name")
-    username: Optional[str] = Field(default=None, description="User's username")
-    language_code: Optional[str] = Field(
-        default=None, description="User's language code"
-    )
+    user_id: int
+    first_name: str
+    last_name: Optional[str] = None
+    username: Optional[str] = None
+    language_code: Optional[str] = None
 
 
-class TelegramMessage(BaseModel):
+@dataclass(slots=True, frozen=True)
+class TelegramMessage:
     """Telegram message structure."""
 
-    message_id: int = Field(..., description="Telegram message ID")
-    user: TelegramUser = Field(..., description="Message sender")
-    text: str = Field(..., description="Message text")
-    timestamp: datetime = Field(default_factory=datetime.now)
+    message_id: int
+    user: TelegramUser
+    text: str
+    timestamp: datetime = field(default_factory=datetime.now)
 
 
-class TelegramBotResponse(BaseModel):
+@dataclass(slots=True, frozen=True)
+class TelegramBotResponse:
     """Response structure for Telegram bot."""
 
-    text: str = Field(..., description="Response text to send")
-    parse_mode: Optional[str] = Field(default="HTML", description="Parse mode for formatting")
-    reply_markup: Optional[dict] = Field(default=None, description="Keyboard markup")
-    disable_web_page_preview: bool = Field(
-        default=True, description="Disable web page preview"
-    )
+    text: str
+    parse_mode: Optional[str] = "HTML"
+    reply_markup: Optional[dict] = None
+    disable_web_page_preview: bool = True